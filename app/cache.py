@@ -2,26 +2,106 @@
 Simple in-memory caching system for LLM responses
 """
 import hashlib
+import heapq
 import json
 import time
 import logging
-from typing import Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple, Union
 from threading import Lock
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional speedup
+    xxhash = None
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Number of independently locked cache shards (must be a power of two)
+NUM_SHARDS = 8
+
+# Fixed-shape cache context as (name, value) pairs, hashed without building JSON
+ContextItems = Tuple[Tuple[str, Any], ...]
+
+def dumps_sorted(obj: Any) -> bytes:
+    """Serialize to canonical (sorted-key) JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode()
+
+def _new_hasher(data: bytes):
+    """Start a 64-bit key hash (XXH3 when available, else BLAKE2b); both give 16 hex chars"""
+    if xxhash is not None:
+        return xxhash.xxh3_64(data)
+    return hashlib.blake2b(data, digest_size=8)
+
 class CacheEntry:
-    """Cache entry with data and metadata"""
-    data: Any
-    timestamp: float
-    access_count: int = 0
-    last_accessed: float = None
+    """Cache entry with data and metadata (times are time.monotonic() values)"""
+    __slots__ = ('data', 'timestamp', 'expires_at', 'access_count')
+    
+    def __init__(self, data: Any, timestamp: float, expires_at: float):
+        self.data = data
+        self.timestamp = timestamp
+        self.expires_at = expires_at
+        self.access_count = 0
+    
+    def reset(self, data: Any, timestamp: float, expires_at: float) -> None:
+        """Reinitialize a recycled entry in place"""
+        self.data = data
+        self.timestamp = timestamp
+        self.expires_at = expires_at
+        self.access_count = 0
+
+class CacheShard:
+    """A slice of the cache with its own entries, lock, entry freelist and expiry heap"""
+    __slots__ = ('entries', 'lock', 'free', 'max_free', 'expiry_heap')
+    
+    def __init__(self, max_free: int):
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.lock = Lock()
+        self.free: List[CacheEntry] = []
+        self.max_free = max_free
+        # (expires_at, key) pairs; may hold stale pairs for replaced or evicted keys
+        self.expiry_heap: List[Tuple[float, str]] = []
+    
+    def new_entry(self, data: Any, timestamp: float, expires_at: float) -> CacheEntry:
+        """Get an entry from the freelist, allocating only when it is empty"""
+        if self.free:
+            entry = self.free.pop()
+            entry.reset(data, timestamp, expires_at)
+            return entry
+        return CacheEntry(data, timestamp, expires_at)
+    
+    def push_expiry(self, expires_at: float, key: str) -> None:
+        """Track an expiry deadline, compacting the heap when stale pairs pile up"""
+        heapq.heappush(self.expiry_heap, (expires_at, key))
+        if len(self.expiry_heap) > 2 * len(self.entries) + 16:
+            self.expiry_heap = [(entry.expires_at, k) for k, entry in self.entries.items()]
+            heapq.heapify(self.expiry_heap)
+    
+    def remove(self, key: str) -> None:
+        """Remove an entry and recycle it into the freelist"""
+        self.recycle(self.entries.pop(key))
+    
+    def recycle(self, entry: CacheEntry) -> None:
+        """Return an entry to the freelist, dropping its data reference"""
+        entry.data = None
+        if len(self.free) < self.max_free:
+            self.free.append(entry)
 
 class SimpleCache:
     """
     Simple in-memory cache with TTL and LRU eviction
+    
+    Keys are spread over NUM_SHARDS shards, each guarded by its own lock so
+    that concurrent requests for different queries do not contend. Within a
+    shard, entries are kept in an OrderedDict in recency order (least recently
+    used first), so lookups, inserts and evictions are all O(1).
     """
     
     def __init__(self, max_size: int = 1000, default_ttl: int = 3600):
@@ -29,15 +109,17 @@ class SimpleCache:
         Initialize cache
         
         Args:
-            max_size: Maximum number of entries to store
+            max_size: Maximum number of entries to store (split evenly across shards)
             default_ttl: Default time-to-live in seconds (1 hour)
         """
         self.max_size = max_size
         self.default_ttl = default_ttl
-        self._cache: Dict[str, CacheEntry] = {}
-        self._lock = Lock()
+        self._shard_max_size = max(1, max_size // NUM_SHARDS)
+        self._shards: List[CacheShard] = [
+            CacheShard(max_free=self._shard_max_size) for _ in range(NUM_SHARDS)
+        ]
         
-        logger.info(f"Cache initialized with max_size={max_size}, ttl={default_ttl}s")
+        logger.info("Cache initialized with max_size=%s, ttl=%ss, shards=%s", max_size, default_ttl, NUM_SHARDS)
     
     def _generate_key(self, query: str, context: Dict[str, Any] = None) -> str:
         """
@@ -46,7 +128,7 @@ class SimpleCache:
         Args:
             query: The user query
             context: Additional context (e.g., database schema hash)
-            
+        
         Returns:
             str: Cache key
         """
@@ -60,127 +142,177 @@ class SimpleCache:
         }
         
         # Generate hash
-        cache_str = json.dumps(cache_data, sort_keys=True)
-        return hashlib.md5(cache_str.encode()).hexdigest()
+        return _new_hasher(dumps_sorted(cache_data)).hexdigest()
+    
+    def _generate_key_fast(self, query: str, context_items: ContextItems = ()) -> str:
+        """
+        Generate a cache key by feeding query and context pairs straight into the hasher
+        
+        Args:
+            query: The user query
+            context_items: Context as (name, value) pairs, in a fixed order
+        
+        Returns:
+            str: Cache key
+        """
+        h = _new_hasher(query.lower().strip().encode())
+        for name, value in context_items:
+            h.update(b'\x1f')
+            h.update(name.encode())
+            h.update(b'\x1e')
+            h.update(str(value).encode())
+        return h.hexdigest()
+    
+    def key_for(self, query: str, context: Union[Dict[str, Any], ContextItems, None]) -> str:
+        """
+        Get the cache key for a query and context
+        
+        Uses the fast key path for tuple contexts and the JSON path for dicts.
+        The key is a fixed-length hex digest, so it is also a cheap fingerprint
+        for the request outside the cache.
+        """
+        if isinstance(context, tuple):
+            return self._generate_key_fast(query, context)
+        return self._generate_key(query, context)
     
-    def get(self, query: str, context: Dict[str, Any] = None) -> Optional[Any]:
+    def _get_shard(self, key: str) -> CacheShard:
+        """Get the shard responsible for a key (keys are hex digests)"""
+        return self._shards[int(key[:8], 16) & (NUM_SHARDS - 1)]
+    
+    def get(self, query: str, context: Union[Dict[str, Any], ContextItems] = None) -> Optional[Any]:
         """
         Get cached response for a query
         
         Args:
             query: The user query
-            context: Additional context
-            
+            context: Additional context, as a dict or as ContextItems pairs
+        
         Returns:
             Cached data or None if not found/expired
         """
-        key = self._generate_key(query, context)
+        key = self.key_for(query, context)
+        shard = self._get_shard(key)
         
-        with self._lock:
-            if key not in self._cache:
-                logger.debug(f"Cache miss for key: {key[:8]}...")
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                logger.debug("Cache miss for key: %s...", key[:8])
                 return None
             
-            entry = self._cache[key]
-            current_time = time.time()
+            current_time = time.monotonic()
             
             # Check if expired
-            if current_time - entry.timestamp > self.default_ttl:
-                logger.debug(f"Cache expired for key: {key[:8]}...")
-                del self._cache[key]
+            if current_time > entry.expires_at:
+                logger.debug("Cache expired for key: %s...", key[:8])
+                shard.remove(key)
                 return None
             
-            # Update access statistics
+            # Mark as most recently used and update access statistics
+            shard.entries.move_to_end(key)
             entry.access_count += 1
-            entry.last_accessed = current_time
             
-            logger.debug(f"Cache hit for key: {key[:8]}... (accessed {entry.access_count} times)")
+            logger.debug("Cache hit for key: %s... (accessed %s times)", key[:8], entry.access_count)
             return entry.data
     
-    def set(self, query: str, data: Any, context: Dict[str, Any] = None, ttl: int = None) -> None:
+    def set(self, query: str, data: Any, context: Union[Dict[str, Any], ContextItems] = None,
+            ttl: int = None) -> None:
         """
         Store data in cache
         
         Args:
             query: The user query
             data: Data to cache
-            context: Additional context
+            context: Additional context, as a dict or as ContextItems pairs
             ttl: Time-to-live override
         """
-        key = self._generate_key(query, context)
-        current_time = time.time()
+        key = self.key_for(query, context)
+        shard = self._get_shard(key)
+        current_time = time.monotonic()
+        expires_at = current_time + (ttl or self.default_ttl)
         
-        with self._lock:
-            # Check if we need to evict entries
-            if len(self._cache) >= self.max_size:
-                self._evict_lru()
+        with shard.lock:
+            # Store entry as the most recently used, reusing an existing or freed entry
+            entry = shard.entries.get(key)
+            if entry is not None:
+                entry.reset(data, current_time, expires_at)
+            else:
+                shard.entries[key] = shard.new_entry(data, current_time, expires_at)
+            shard.entries.move_to_end(key)
+            shard.push_expiry(expires_at, key)
             
-            # Store new entry
-            self._cache[key] = CacheEntry(
-                data=data,
-                timestamp=current_time,
-                last_accessed=current_time
-            )
+            # Evict least recently used entries if over capacity
+            while len(shard.entries) > self._shard_max_size:
+                self._evict_lru(shard)
             
-            logger.debug(f"Cached data for key: {key[:8]}... (cache size: {len(self._cache)})")
+            logger.debug("Cached data for key: %s... (shard size: %s)", key[:8], len(shard.entries))
     
-    def _evict_lru(self) -> None:
-        """Evict least recently used entries"""
-        if not self._cache:
+    def _evict_lru(self, shard: CacheShard) -> None:
+        """Evict the least recently used entry of a shard (caller holds the shard lock)"""
+        if not shard.entries:
             return
         
-        # Find LRU entry
-        lru_key = min(
-            self._cache.keys(),
-            key=lambda k: self._cache[k].last_accessed or self._cache[k].timestamp
-        )
-        
-        del self._cache[lru_key]
-        logger.debug(f"Evicted LRU entry: {lru_key[:8]}...")
+        lru_key, entry = shard.entries.popitem(last=False)
+        shard.recycle(entry)
+        logger.debug("Evicted LRU entry: %s...", lru_key[:8])
     
     def clear(self) -> None:
         """Clear all cache entries"""
-        with self._lock:
-            self._cache.clear()
-            logger.info("Cache cleared")
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.expiry_heap.clear()
+        logger.info("Cache cleared")
     
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        with self._lock:
-            total_accesses = sum(entry.access_count for entry in self._cache.values())
-            
-            return {
-                "size": len(self._cache),
-                "max_size": self.max_size,
-                "total_accesses": total_accesses,
-                "hit_rate": 0.0 if total_accesses == 0 else total_accesses / len(self._cache),
-                "oldest_entry": min(
-                    (entry.timestamp for entry in self._cache.values()),
-                    default=None
-                ),
-                "newest_entry": max(
-                    (entry.timestamp for entry in self._cache.values()),
-                    default=None
-                )
-            }
+        size = 0
+        total_accesses = 0
+        oldest_entry = None
+        newest_entry = None
+        
+        for shard in self._shards:
+            with shard.lock:
+                size += len(shard.entries)
+                for entry in shard.entries.values():
+                    total_accesses += entry.access_count
+                    if oldest_entry is None or entry.timestamp < oldest_entry:
+                        oldest_entry = entry.timestamp
+                    if newest_entry is None or entry.timestamp > newest_entry:
+                        newest_entry = entry.timestamp
+        
+        # Entry times are monotonic; report them as wall-clock timestamps
+        wall_offset = time.time() - time.monotonic()
+        
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "total_accesses": total_accesses,
+            "hit_rate": 0.0 if total_accesses == 0 else total_accesses / size,
+            "oldest_entry": None if oldest_entry is None else oldest_entry + wall_offset,
+            "newest_entry": None if newest_entry is None else newest_entry + wall_offset
+        }
     
     def cleanup_expired(self) -> int:
         """Remove expired entries and return count of removed entries"""
-        current_time = time.time()
-        expired_keys = []
+        current_time = time.monotonic()
+        removed = 0
         
-        with self._lock:
-            for key, entry in self._cache.items():
-                if current_time - entry.timestamp > self.default_ttl:
-                    expired_keys.append(key)
-            
-            for key in expired_keys:
-                del self._cache[key]
+        for shard in self._shards:
+            with shard.lock:
+                # Pop deadlines in expiry order and stop at the first live one
+                heap = shard.expiry_heap
+                while heap and heap[0][0] < current_time:
+                    expires_at, key = heapq.heappop(heap)
+                    entry = shard.entries.get(key)
+                    # Skip pairs superseded by a later set or already removed
+                    if entry is not None and entry.expires_at == expires_at:
+                        shard.remove(key)
+                        removed += 1
         
-        if expired_keys:
-            logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
+        if removed:
+            logger.info("Cleaned up %s expired cache entries", removed)
         
-        return len(expired_keys)
+        return removed
 
 # Global cache instance
 query_cache = SimpleCache(max_size=500, default_ttl=1800)  # 30 minutes TTL
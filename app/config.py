@@ -1,10 +1,8 @@
 """
 Configuration management for the GenAI E-commerce Agent
 """
-import os
-from typing import Optional
-from pydantic_settings import BaseSettings
-from pydantic import validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import field_validator
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -28,8 +26,11 @@ class Settings(BaseSettings):
     # Server Configuration
     host: str = "0.0.0.0"
     port: int = 8000
+    workers: int = 0  # 0 runs one worker process per CPU
+    timeout_keep_alive: int = 30
     
-    @validator('gemini_api_key')
+    @field_validator('gemini_api_key')
+    @classmethod
     def validate_api_key(cls, v):
         if not v or v == "your_actual_api_key_here":
             raise ValueError(
@@ -40,21 +41,21 @@ class Settings(BaseSettings):
             raise ValueError("GEMINI_API_KEY appears to be invalid (too short)")
         return v
     
-    @validator('max_query_length')
+    @field_validator('max_query_length')
+    @classmethod
     def validate_query_length(cls, v):
         if v < 10 or v > 10000:
             raise ValueError("max_query_length must be between 10 and 10000")
         return v
     
-    @validator('rate_limit_per_minute')
+    @field_validator('rate_limit_per_minute')
+    @classmethod
     def validate_rate_limit(cls, v):
         if v < 1 or v > 1000:
             raise ValueError("rate_limit_per_minute must be between 1 and 1000")
         return v
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
 
 # Global settings instance
 try:
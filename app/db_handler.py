@@ -1,13 +1,21 @@
 import sqlite3
 import os
 import logging
-from typing import List, Dict, Any, Optional
-import pandas as pd
-from pathlib import Path
+from typing import List, Dict, Any
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# (table, column) pairs indexed at startup, mirroring load_data.INDEXES so
+# databases built before the indexes existed get them too; the date indexes
+# back the MIN/MAX(date) prompt context
+INDEXES = [
+    ('sales', 'date'),
+    ('total_sales', 'date'),
+    ('sales', 'item_id'),
+    ('eligibility', 'item_id'),
+]
+
 class DatabaseHandler:
     def __init__(self, db_path: str = None):
         """
@@ -28,6 +36,9 @@ class DatabaseHandler:
 
         self.db_path = db_path
         self.connection = None
+        # Schema cache, keyed by PRAGMA schema_version
+        self._schema_cached = None
+        self._schema_version = None
         self._connect()
     
     def _connect(self):
@@ -37,11 +48,11 @@ class DatabaseHandler:
             db_dir = os.path.dirname(self.db_path)
             if db_dir and not os.path.exists(db_dir):
                 os.makedirs(db_dir)
-                logger.info(f"Created database directory: {db_dir}")
+                logger.info("Created database directory: %s", db_dir)
 
             # Check if database file exists
             if not os.path.exists(self.db_path):
-                logger.warning(f"Database file does not exist: {self.db_path}")
+                logger.warning("Database file does not exist: %s", self.db_path)
                 raise FileNotFoundError(f"Database file not found: {self.db_path}")
 
             self.connection = sqlite3.connect(
@@ -49,20 +60,36 @@ class DatabaseHandler:
                 check_same_thread=False,  # Allow multi-threading
                 timeout=30.0  # 30 second timeout
             )
-            self.connection.row_factory = sqlite3.Row  # Enable dict-like access
 
             # Enable foreign key constraints
             self.connection.execute("PRAGMA foreign_keys = ON")
 
-            logger.info(f"Connected to database: {self.db_path}")
+            # Tune the connection for a read-heavy analytics workload
+            self._apply_performance_pragmas()
+
+            logger.info("Connected to database: %s", self.db_path)
 
             # Validate database structure
             self._validate_database_structure()
 
         except Exception as e:
-            logger.error(f"Failed to connect to database: {e}")
+            logger.error("Failed to connect to database: %s", e)
             raise
 
+    def _apply_performance_pragmas(self):
+        """Enable WAL and larger in-memory caches for faster SELECTs"""
+        pragmas = [
+            "PRAGMA journal_mode = WAL",
+            "PRAGMA synchronous = NORMAL",
+            "PRAGMA cache_size = -65536",  # 64 MB page cache
+            "PRAGMA temp_store = MEMORY",
+        ]
+        for pragma in pragmas:
+            try:
+                self.connection.execute(pragma)
+            except sqlite3.Error as e:
+                logger.warning("Could not apply '%s': %s", pragma, e)
+
     def _validate_database_structure(self):
         """Validate that required tables exist"""
         try:
@@ -74,22 +101,44 @@ class DatabaseHandler:
             missing_tables = [table for table in required_tables if table not in tables]
 
             if missing_tables:
-                logger.warning(f"Missing required tables: {missing_tables}")
+                logger.warning("Missing required tables: %s", missing_tables)
             else:
                 logger.info("All required tables found in database")
 
+            self._ensure_indexes(tables)
+
         except Exception as e:
-            logger.warning(f"Could not validate database structure: {e}")
+            logger.warning("Could not validate database structure: %s", e)
     
-    def execute_query(self, sql_query: str) -> List[Dict[str, Any]]:
+    def _ensure_indexes(self, tables: List[str]):
+        """Create any missing lookup indexes on the tables that exist"""
+        for table, column in INDEXES:
+            if table not in tables:
+                continue
+            try:
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column})"
+                )
+            except sqlite3.Error as e:
+                logger.warning("Could not create index on %s(%s): %s", table, column, e)
+        self.connection.commit()
+
+    @staticmethod
+    def _rows_to_dicts(cursor: sqlite3.Cursor, rows: List[tuple]) -> List[Dict[str, Any]]:
+        """Convert tuple rows to dictionaries, reading the column names once"""
+        cols = [d[0] for d in cursor.description]
+        return [dict(zip(cols, row)) for row in rows]
+
+    def execute_query(self, sql_query: str, max_rows: int = 10000) -> List[Dict[str, Any]]:
         """
         Execute a SQL query with enhanced security and error handling
 
         Args:
             sql_query: SQL query to execute (must be a SELECT statement)
+            max_rows: Maximum number of rows to fetch
 
         Returns:
-            List of dictionaries representing the query results
+            List of dictionaries representing the query results (at most max_rows rows)
 
         Raises:
             ValueError: If query is not a SELECT statement
@@ -104,60 +153,64 @@ class DatabaseHandler:
             raise ValueError("Only SELECT queries are allowed")
 
         try:
-            logger.debug(f"Executing SQL query: {sql_query}")
+            logger.debug("Executing SQL query: %s", sql_query)
             cursor = self.connection.cursor()
 
             # Set query timeout and row limit for safety
             cursor.execute("PRAGMA query_timeout = 30000")  # 30 seconds
             cursor.execute(sql_query)
 
-            # Fetch results with a reasonable limit
-            rows = cursor.fetchmany(10000)  # Limit to 10k rows max
+            # Fetch results up to the row limit
+            rows = cursor.fetchmany(max_rows)
 
             # Convert to list of dictionaries
-            results = []
-            for row in rows:
-                results.append(dict(row))
+            results = self._rows_to_dicts(cursor, rows)
 
-            logger.info(f"Query returned {len(results)} rows")
+            logger.info("Query returned %s rows", len(results))
             return results
 
         except sqlite3.Error as e:
-            logger.error(f"SQLite error: {e}")
-            logger.error(f"SQL was: {sql_query}")
+            logger.error("SQLite error: %s", e)
+            logger.error("SQL was: %s", sql_query)
             raise Exception(f"Database query failed: {str(e)}")
         except Exception as e:
-            logger.error(f"Query execution failed: {e}")
-            logger.error(f"SQL was: {sql_query}")
+            logger.error("Query execution failed: %s", e)
+            logger.error("SQL was: %s", sql_query)
             raise Exception(f"Query execution failed: {str(e)}")
     
     def get_schema(self) -> Dict[str, Any]:
         """
         Get database schema information
         
+        The result is cached until PRAGMA schema_version changes, so repeat
+        calls cost a single pragma. Callers must not mutate the returned dict.
+        
         Returns:
             Dictionary containing table schemas
         """
         try:
             cursor = self.connection.cursor()
             
+            cursor.execute("PRAGMA schema_version")
+            version = cursor.fetchone()[0]
+            if self._schema_cached is not None and version == self._schema_version:
+                return self._schema_cached
+            
             # Get list of tables
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
             tables = [row[0] for row in cursor.fetchall()]
             
+            # Reuse one cursor for every PRAGMA table_info call
             schema = {}
             for table in tables:
                 cursor.execute(f"PRAGMA table_info({table})")
-                columns = []
-                for row in cursor.fetchall():
-                    columns.append({
-                        "name": row[1],
-                        "type": row[2],
-                        "not_null": bool(row[3]),
-                        "primary_key": bool(row[5])
-                    })
-                schema[table] = columns
+                schema[table] = [
+                    {"name": row[1], "type": row[2], "not_null": bool(row[3]), "primary_key": bool(row[5])}
+                    for row in cursor.fetchall()
+                ]
             
+            self._schema_cached = schema
+            self._schema_version = version
             return schema
             
         except Exception as e:
@@ -182,7 +235,7 @@ class DatabaseHandler:
                 # Get sample data from specific table
                 cursor.execute(f"SELECT * FROM {table_name} LIMIT {limit}")
                 rows = cursor.fetchall()
-                return {table_name: [dict(row) for row in rows]}
+                return {table_name: self._rows_to_dicts(cursor, rows)}
             else:
                 # Get sample data from all tables
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
@@ -192,7 +245,7 @@ class DatabaseHandler:
                 for table in tables:
                     cursor.execute(f"SELECT * FROM {table} LIMIT {limit}")
                     rows = cursor.fetchall()
-                    sample_data[table] = [dict(row) for row in rows]
+                    sample_data[table] = self._rows_to_dicts(cursor, rows)
                 
                 return sample_data
                 
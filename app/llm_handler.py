@@ -1,157 +1,274 @@
-import google.generativeai as genai
 import logging
-from typing import List, Dict, Any, Optional
-import json
+from typing import List, Dict, Any, Optional, Tuple
 import datetime
 import hashlib
+import re
+import time
+import json
 from app.config import get_settings
 from app.db_handler import DatabaseHandler
-from app.cache import query_cache
+from app.cache import query_cache, dumps_sorted
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Relative date patterns rewritten against the dataset's latest date
+# BETWEEN date('now', '-X days') AND date('now')
+_RE_BETWEEN = re.compile(
+    r"between\s+date\('now',\s*'-(\d+)\s+days?'\)\s+and\s+date\('now'\)", re.IGNORECASE
+)
+# date('now', '-X days')
+_RE_DAYS_BACK = re.compile(r"date\('now',\s*'-(\d+)\s+days?'\)", re.IGNORECASE)
+# date('now')
+_RE_NOW = re.compile(r"date\('now'\)", re.IGNORECASE)
+
+# How long dataset date lookups are reused before re-querying (seconds)
+DATE_CACHE_TTL = 300
+
+# Known table column corrections applied when describing the schema to the LLM
+_COLUMN_RENAME_MAP = {
+    'sales': {
+        'sale_date': 'date',
+        'revenue': 'ad_sales',
+        'quantity': 'units_sold',
+        'product_id': 'item_id',
+    },
+    'total_sales': {
+        'sale_date': 'date',
+        'revenue': 'total_sales',
+        'quantity': 'total_units_ordered',
+        'product_id': 'item_id',
+    },
+    'eligibility': {
+        'eligibility_datetime_utc': 'eligibility_datetime_utc',
+        'item_id': 'item_id',
+        'eligibility': 'eligibility',
+        'message': 'message',
+    }
+}
+
+# Fixed cache context for response generation
+_RESPONSE_CACHE_CONTEXT = (("type", "response_generation"),)
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy scalars/Decimal as floats and anything else as its string form"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+def _compact_records(records: List[Dict[str, Any]], n_rows: int = 3, n_fields: int = 8) -> str:
+    """
+    Render the first records as compact JSON for use in an LLM prompt
+
+    Args:
+        records: Query result rows
+        n_rows: Number of rows to include
+        n_fields: Number of leading fields to keep per row
+
+    Returns:
+        str: JSON array of the truncated rows
+    """
+    trunc = [dict(list(record.items())[:n_fields]) for record in records[:n_rows]]
+    if orjson is not None:
+        return orjson.dumps(trunc, default=_json_default).decode()
+    return json.dumps(trunc, default=_json_default, separators=(',', ':'))
+
+# Largest single-row result answered from a template instead of the LLM
+TRIVIAL_MAX_FIELDS = 3
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _format_value(value: Any) -> str:
+    """Format a scalar result for a templated response (numbers unrounded, with thousands separators)"""
+    if isinstance(value, bool) or value is None:
+        return str(value)
+    if _is_number(value):
+        return f"{value:,}"
+    return str(value)
+
+def _trivial_response(data: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Answer results whose narration is deterministic without calling the LLM
+
+    Args:
+        data: Query result rows
+
+    Returns:
+        Optional[str]: Templated response, or None if the LLM should be used
+    """
+    if not data:
+        return "No data found for your query."
+    if len(data) != 1 or len(data[0]) > TRIVIAL_MAX_FIELDS:
+        return None
+    # Only obvious aggregate shapes: a single value, or a few numbers such as
+    # SELECT COUNT(*), SUM(...), AVG(...); lookups of a row go to the LLM
+    row = data[0]
+    if len(row) > 1 and not all(_is_number(value) for value in row.values()):
+        return None
+    parts = [f"{key.replace('_', ' ')}: {_format_value(value)}" for key, value in row.items()]
+    if len(parts) == 1:
+        return f"The result of your query is {parts[0]}."
+    return "The results of your query are " + ", ".join(parts) + "."
+
 class LLMHandler:
     def __init__(self):
         """Initialize the LLM handler with Gemini 2.5 and enhanced security"""
         settings = get_settings()
 
         try:
+            # Imported lazily: the SDK is heavy and only needed once a handler exists
+            import google.generativeai as genai
+            self._genai = genai
             genai.configure(api_key=settings.gemini_api_key)
             self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
             logger.info("LLM handler initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize LLM handler: {e}")
+            logger.error("Failed to initialize LLM handler: %s", e)
             raise ValueError(f"Failed to initialize LLM: {e}")
 
         # Initialize a database handler to get schema
         self.db_handler = DatabaseHandler()
         self.settings = settings
 
-    def _get_schema_str(self):
+        # Schema-derived artifacts, rebuilt only when DatabaseHandler.get_schema()
+        # returns a new schema dict (it caches one per PRAGMA schema_version)
+        self._schema_cache = None
+        self._schema_str_cache = None
+        self._schema_hash_cache = None
+
+        # (monotonic time, value) pairs for the dataset date lookups
+        self._latest_date_cache: Optional[Tuple[float, str]] = None
+        self._date_info_cache: Optional[Tuple[float, str]] = None
+
+        # (schema_str, date_info, prefix, suffix) for the SQL generation prompt
+        self._prompt_template: Optional[Tuple[str, str, str, str]] = None
+
+    def _refresh_schema_cache(self) -> None:
+        """Rebuild the cached schema string and schema hash if the schema changed"""
+        # get_schema() costs one PRAGMA schema_version while the schema is
+        # unchanged and then returns the very same dict, so identity suffices
         schema = self.db_handler.get_schema()
-        # Add a mapping for known table column corrections
-        column_rename_map = {
-            'sales': {
-                'sale_date': 'date',
-                'revenue': 'ad_sales',
-                'quantity': 'units_sold',
-                'product_id': 'item_id',
-            },
-            'total_sales': {
-                'sale_date': 'date',
-                'revenue': 'total_sales',
-                'quantity': 'total_units_ordered',
-                'product_id': 'item_id',
-            },
-            'eligibility': {
-                'eligibility_datetime_utc': 'eligibility_datetime_utc',
-                'item_id': 'item_id',
-                'eligibility': 'eligibility',
-                'message': 'message',
-            }
-        }
-        schema_str = "\n".join(
-            f"Table: {table}\nColumns: {', '.join(column_rename_map.get(table, {}).get(col['name'], col['name']) for col in cols)}"
+        if schema is self._schema_cache:
+            return
+
+        self._schema_cache = schema
+        self._schema_str_cache = self._build_schema_str(schema)
+        self._schema_hash_cache = hashlib.blake2b(dumps_sorted(schema), digest_size=8).hexdigest()
+        logger.debug("Schema cache refreshed")
+
+    def _get_schema_str(self):
+        self._refresh_schema_cache()
+        return self._schema_str_cache
+
+    def _build_schema_str(self, schema: Dict[str, Any]) -> str:
+        return "\n".join(
+            f"Table: {table}\nColumns: "
+            + ', '.join([_COLUMN_RENAME_MAP.get(table, {}).get(col['name'], col['name']) for col in cols])
             for table, cols in schema.items()
         )
-        return schema_str
+
+    def invalidate_date_cache(self) -> None:
+        """Drop cached dataset dates, e.g. after the tables have been reloaded"""
+        self._latest_date_cache = None
+        self._date_info_cache = None
+        self._prompt_template = None
+
+    @staticmethod
+    def _fresh(cache: Optional[Tuple[float, str]]) -> bool:
+        return cache is not None and time.monotonic() - cache[0] < DATE_CACHE_TTL
 
     def _get_dataset_date_info(self) -> str:
         """Get information about the date range in the dataset"""
+        if self._fresh(self._date_info_cache):
+            return self._date_info_cache[1]
+
         try:
             cursor = self.db_handler.connection.cursor()
-            cursor.execute("SELECT MIN(date), MAX(date) FROM sales")
+            # Separate subqueries let SQLite answer each extreme from the date index
+            cursor.execute("SELECT (SELECT MIN(date) FROM sales), (SELECT MAX(date) FROM sales)")
             result = cursor.fetchone()
             if result and result[0] and result[1]:
                 min_date, max_date = result
-                return f"Dataset contains dates from {min_date} to {max_date}"
+                date_info = f"Dataset contains dates from {min_date} to {max_date}"
+                self._date_info_cache = (time.monotonic(), date_info)
+                return date_info
             else:
                 return "Dataset date range: unknown"
         except Exception as e:
-            logger.warning(f"Could not get dataset date info: {e}")
+            logger.warning("Could not get dataset date info: %s", e)
             return "Dataset date range: unknown"
 
     def _get_latest_date(self) -> str:
         """Get the latest date in the dataset"""
+        if self._fresh(self._latest_date_cache):
+            return self._latest_date_cache[1]
+
         try:
             cursor = self.db_handler.connection.cursor()
             cursor.execute("SELECT MAX(date) FROM sales")
             result = cursor.fetchone()
             if result and result[0]:
+                self._latest_date_cache = (time.monotonic(), result[0])
                 return result[0]
             else:
                 return "2025-06-01"  # fallback
         except Exception as e:
-            logger.warning(f"Could not get latest date: {e}")
+            logger.warning("Could not get latest date: %s", e)
             return "2025-06-01"  # fallback
 
     def _replace_relative_dates(self, sql_query: str) -> str:
         """Replace relative date functions with actual dataset dates"""
-        import datetime
-        import re
-
         try:
             # Get the latest date from the dataset
             latest_date = self._get_latest_date()
             latest_dt = datetime.datetime.strptime(latest_date, "%Y-%m-%d")
 
-            # Replace various date patterns
-            replacements = []
-
-            # Pattern 1: date('now', '-X days') or DATE('now', '-X days')
-            pattern1 = r"(?i)date\('now',\s*'-(\d+)\s+days?'\)"
-            matches = re.finditer(pattern1, sql_query)
-            for match in matches:
-                days_back = int(match.group(1))
-                target_date = latest_dt - datetime.timedelta(days=days_back)
-                target_date_str = target_date.strftime("%Y-%m-%d")
-                replacements.append((match.group(0), f"DATE('{target_date_str}')"))
-
-            # Pattern 2: date('now') or DATE('now')
-            pattern2 = r"(?i)date\('now'\)"
-            matches = re.finditer(pattern2, sql_query)
-            for match in matches:
-                replacements.append((match.group(0), f"DATE('{latest_date}')"))
-
-            # Pattern 3: BETWEEN Date('now', '-X days') AND Date('now')
-            pattern3 = r"(?i)between\s+date\('now',\s*'-(\d+)\s+days?'\)\s+and\s+date\('now'\)"
-            matches = re.finditer(pattern3, sql_query)
-            for match in matches:
-                days_back = int(match.group(1))
-                start_date = latest_dt - datetime.timedelta(days=days_back)
-                start_date_str = start_date.strftime("%Y-%m-%d")
-                replacements.append((match.group(0), f"BETWEEN DATE('{start_date_str}') AND DATE('{latest_date}')"))
-
-            # Apply all replacements
-            for old_text, new_text in replacements:
-                sql_query = sql_query.replace(old_text, new_text)
-                logger.info(f"Replaced '{old_text}' with '{new_text}'")
+            def days_back(match) -> str:
+                target_date = latest_dt - datetime.timedelta(days=int(match.group(1)))
+                return target_date.strftime("%Y-%m-%d")
+
+            def replace(pattern, build, text: str) -> str:
+                def callback(match):
+                    new_text = build(match)
+                    logger.info("Replaced '%s' with '%s'", match.group(0), new_text)
+                    return new_text
+                return pattern.sub(callback, text)
+
+            # BETWEEN first so its inner date('now', ...) is not rewritten on its own
+            sql_query = replace(
+                _RE_BETWEEN,
+                lambda m: f"BETWEEN DATE('{days_back(m)}') AND DATE('{latest_date}')",
+                sql_query
+            )
+            sql_query = replace(_RE_DAYS_BACK, lambda m: f"DATE('{days_back(m)}')", sql_query)
+            sql_query = replace(_RE_NOW, lambda m: f"DATE('{latest_date}')", sql_query)
 
             return sql_query
 
         except Exception as e:
-            logger.warning(f"Failed to replace relative dates: {e}")
+            logger.warning("Failed to replace relative dates: %s", e)
             return sql_query
 
-    async def generate_sql(self, natural_query: str) -> str:
-        """
-        Generate SQL query from natural language query with caching
+    def _get_sql_prompt_template(self) -> Tuple[str, str]:
         """
-        # Create cache context with schema hash for invalidation
-        schema = self.db_handler.get_schema()
-        schema_hash = hashlib.md5(json.dumps(schema, sort_keys=True).encode()).hexdigest()
-        cache_context = {"schema_hash": schema_hash, "type": "sql_generation"}
-
-        # Check cache first
-        cached_sql = query_cache.get(natural_query, cache_context)
-        if cached_sql:
-            logger.info(f"Using cached SQL for query: {natural_query[:50]}...")
-            return cached_sql
+        Get the SQL generation prompt split around the natural language query
 
+        The template only depends on the schema string and dataset date info, so
+        it is rebuilt only when either of them changes.
+        """
         schema_str = self._get_schema_str()
         date_info = self._get_dataset_date_info()
 
-        prompt = f"""
+        if self._prompt_template is not None and self._prompt_template[:2] == (schema_str, date_info):
+            return self._prompt_template[2:]
+
+        prefix = f"""
 You are working with the following SQLite database schema:
 {schema_str}
 
@@ -167,48 +284,70 @@ IMPORTANT for date queries:
 - Use DATE() function with YYYY-MM-DD format for all date comparisons
 
 Natural language query:
-\"{natural_query}\"
+\""""
+        suffix = """\"
 
 Return only the SQL query, no explanations or additional text. The query must be a SELECT statement.
 """
+        self._prompt_template = (schema_str, date_info, prefix, suffix)
+        return prefix, suffix
+
+    async def generate_sql(self, natural_query: str) -> str:
+        """
+        Generate SQL query from natural language query with caching
+        """
+        # Create cache context with schema hash for invalidation
+        self._refresh_schema_cache()
+        cache_context = (("schema_hash", self._schema_hash_cache), ("type", "sql_generation"))
+
+        # Check cache first
+        cached_sql = query_cache.get(natural_query, cache_context)
+        if cached_sql:
+            logger.info("Using cached SQL for query: %s...", natural_query[:50])
+            return cached_sql
+
+        prefix, suffix = self._get_sql_prompt_template()
+        prompt = prefix + natural_query + suffix
         try:
-            logger.info(f"Generating SQL for query: {natural_query[:50]}...")
-            response = self.model.generate_content(prompt)
+            logger.info("Generating SQL for query: %s...", natural_query[:50])
+            response = await self.model.generate_content_async(prompt)
             sql_query = response.text.strip()
             # Remove code block markers if present
             if sql_query.startswith('```'):
                 sql_query = sql_query.strip('`')
                 sql_query = sql_query.replace('sql', '', 1).strip()
             sql_query = sql_query.strip()
-            logger.debug("LLM generated SQL:", sql_query)
+            logger.debug("LLM generated SQL: %s", sql_query)
             if not sql_query.lower().startswith('select'):
                 raise ValueError("Generated query must be a SELECT statement")
 
             # Cache the result
             query_cache.set(natural_query, sql_query, cache_context)
-            logger.info(f"Cached SQL query for: {natural_query[:50]}...")
+            logger.info("Cached SQL query for: %s...", natural_query[:50])
 
             # Enhanced date replacement logic for dataset-relative dates
             sql_query = self._replace_relative_dates(sql_query)
-            print("[DEBUG] Final SQL after patching:", sql_query)
+            logger.debug("Final SQL after patching: %s", sql_query)
             return sql_query
         except Exception as e:
-            print(f"[ERROR] Exception in generate_sql: {e}")
+            logger.error("Exception in generate_sql: %s", e)
             raise Exception(f"Failed to generate SQL: {str(e)}")
 
     async def generate_response(self, original_query: str, data: List[Dict[str, Any]], sql_query: str) -> str:
-        if not data:
-            return "No data found for your query."
+        trivial = _trivial_response(data)
+        if trivial is not None:
+            logger.info("Using templated response for query: %s...", original_query[:50])
+            return trivial
 
         # Create cache key from query, data summary, and SQL
         data_summary = self._summarize_data(data)
         cache_key = f"{original_query}|{sql_query}|{data_summary}"
-        cache_context = {"type": "response_generation"}
+        cache_context = _RESPONSE_CACHE_CONTEXT
 
         # Check cache first
         cached_response = query_cache.get(cache_key, cache_context)
         if cached_response:
-            logger.info(f"Using cached response for query: {original_query[:50]}...")
+            logger.info("Using cached response for query: %s...", original_query[:50])
             return cached_response
 
         prompt = f"""
@@ -228,17 +367,17 @@ Provide a natural language response that:
 Keep the response concise but informative (2-4 sentences).
 """
         try:
-            logger.info(f"Generating response for query: {original_query[:50]}...")
-            response = self.model.generate_content(prompt)
+            logger.info("Generating response for query: %s...", original_query[:50])
+            response = await self.model.generate_content_async(prompt)
             response_text = response.text.strip()
 
             # Cache the result
             query_cache.set(cache_key, response_text, cache_context)
-            logger.info(f"Cached response for: {original_query[:50]}...")
+            logger.info("Cached response for: %s...", original_query[:50])
 
             return response_text
         except Exception as e:
-            logger.warning(f"Failed to generate response: {e}")
+            logger.warning("Failed to generate response: %s", e)
             return f"Based on the data, I found {len(data)} records. Here are the key insights: {self._format_data_insights(data)}"
 
     def _summarize_data(self, data: List[Dict[str, Any]]) -> str:
@@ -246,9 +385,9 @@ Keep the response concise but informative (2-4 sentences).
             return "No data available"
         summary = f"Found {len(data)} records. "
         if len(data) <= 5:
-            summary += f"All records: {data}"
+            summary += f"All records: {_compact_records(data, n_rows=5)}"
         else:
-            summary += f"Sample records: {data[:3]}... (and {len(data)-3} more)"
+            summary += f"Sample records: {_compact_records(data)}... (and {len(data)-3} more)"
         return summary
 
     def _format_data_insights(self, data: List[Dict[str, Any]]) -> str:
@@ -273,7 +412,7 @@ Keep the response concise but informative (2-4 sentences).
             return "Insufficient data for trend analysis."
         prompt = f"""
 Analyze the following e-commerce data for trends and patterns:
-{data[:10]}  # First 10 records for analysis
+{_compact_records(data, n_rows=10)}
 
 Focus on:
 1. Temporal trends (if time data is available)
@@ -284,7 +423,8 @@ Focus on:
 Provide a concise analysis (2-3 sentences).
 """
         try:
-            response = self.model.generate_content(prompt)
+            response = await self.model.generate_content_async(prompt)
             return response.text.strip()
         except Exception as e:
+            logger.warning("Trend analysis failed: %s", e)
             return "Unable to analyze trends at this time." 
\ No newline at end of file
@@ -1,5 +1,6 @@
 import os
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), '../data')
@@ -12,17 +13,69 @@ CSV_TO_TABLE = {
     'total_sales.csv': 'total_sales',
 }
 
-def load_csv_to_sqlite(csv_path, table_name, conn):
-    print(f'Loading {csv_path} into table {table_name}...')
-    df = pd.read_csv(csv_path)
-    df.to_sql(table_name, conn, if_exists='replace', index=False)
+# (table, column) pairs to index; date lookups back the MIN/MAX(date) prompt context
+INDEXES = [
+    ('sales', 'date'),
+    ('total_sales', 'date'),
+    ('sales', 'item_id'),
+    ('eligibility', 'item_id'),
+]
+
+def sqlite_type(dtype):
+    """Map a pandas dtype to the SQLite column type to_sql would have used"""
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+def read_csv(csv_path):
+    print(f'Reading {csv_path}...')
+    return pd.read_csv(csv_path)
+
+def write_dataframe_to_sqlite(df, table_name, conn):
+    print(f'Loading {len(df)} rows into table {table_name}...')
+    columns = ', '.join(f'"{col}" {sqlite_type(dtype)}' for col, dtype in df.dtypes.items())
+    placeholders = ', '.join('?' * len(df.columns))
+
+    # Replace the table and bulk insert all rows in a single transaction
+    conn.execute('BEGIN')
+    try:
+        conn.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+        conn.execute(f'CREATE TABLE "{table_name}" ({columns})')
+        conn.executemany(
+            f'INSERT INTO "{table_name}" VALUES ({placeholders})',
+            df.itertuples(index=False, name=None)
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
     print(f'Loaded {len(df)} rows into {table_name}')
 
+def create_indexes(conn):
+    print('Creating indexes...')
+    for table_name, column in INDEXES:
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table_name}_{column} ON {table_name}({column})')
+    conn.commit()
+
+def load_csv_to_sqlite(csv_path, table_name, conn):
+    write_dataframe_to_sqlite(read_csv(csv_path), table_name, conn)
+
 def main():
+    # Parse the CSVs concurrently (pandas releases the GIL while parsing),
+    # then write them through a single connection to avoid write contention
+    csv_paths = [os.path.join(DATA_DIR, csv_file) for csv_file in CSV_TO_TABLE]
+    with ThreadPoolExecutor(max_workers=len(csv_paths)) as executor:
+        dataframes = list(executor.map(read_csv, csv_paths))
+
     conn = sqlite3.connect(DB_PATH)
-    for csv_file, table_name in CSV_TO_TABLE.items():
-        csv_path = os.path.join(DATA_DIR, csv_file)
-        load_csv_to_sqlite(csv_path, table_name, conn)
+    # Durability is not needed while (re)building the database from CSV
+    conn.execute('PRAGMA journal_mode=MEMORY')
+    conn.execute('PRAGMA synchronous=OFF')
+    for df, table_name in zip(dataframes, CSV_TO_TABLE.values()):
+        write_dataframe_to_sqlite(df, table_name, conn)
+    create_indexes(conn)
     conn.close()
     print('All CSV files loaded successfully.')
 
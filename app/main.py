@@ -1,31 +1,53 @@
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import StreamingResponse, JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 import asyncio
 import time
 import logging
 import csv
+import hashlib
 import io
 import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, TYPE_CHECKING
 import uvicorn
 
+try:
+    import uvloop
+except ImportError:  # uvloop is unavailable on Windows
+    uvloop = None
+else:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+    DefaultResponse = JSONResponse
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, exports fall back to gzip
+    brotli = None
+
 # Use absolute imports for module execution
 from app.config import get_settings, validate_environment
 from app.models import (
-    QueryRequest, QueryResponse, ErrorResponse, HealthResponse,
+    QueryRequest, QueryResponse, HealthResponse,
     SchemaResponse, SampleDataResponse, validate_sql_query
 )
 from app.llm_handler import LLMHandler
 from app.db_handler import DatabaseHandler
-from app.visualizer import DataVisualizer
-from app.cache import query_cache
+from app.cache import SimpleCache, query_cache
 
-# Validate environment on startup
-if not validate_environment():
-    raise RuntimeError("Environment validation failed. Please check your configuration.")
+if TYPE_CHECKING:
+    from app.visualizer import DataVisualizer
 
 settings = get_settings()
 
@@ -36,11 +58,56 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Response timestamp, refreshed twice a second by a background task so
+# handlers do not format a fresh datetime on every request
+TIMESTAMP_REFRESH_INTERVAL = 0.5
+_cached_iso_ts = datetime.now().isoformat()
+
+def _now_iso() -> str:
+    """Get the current ISO timestamp (accurate to TIMESTAMP_REFRESH_INTERVAL)"""
+    return _cached_iso_ts
+
+async def _refresh_timestamp():
+    global _cached_iso_ts
+    while True:
+        _cached_iso_ts = datetime.now().isoformat()
+        await asyncio.sleep(TIMESTAMP_REFRESH_INTERVAL)
+
+def _json_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes with orjson when available, stringifying unknown types"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option, default=str)
+    return json.dumps(obj, indent=2 if indent else None, default=str).encode()
+
+# Number of response characters sent per SSE text frame
+STREAM_CHUNK_SIZE = 48
+
+_FRAME_PREFIX = b"data: "
+_FRAME_SUFFIX = b"\n\n"
+
+def _sse_frame(payload: Dict[str, Any]) -> bytes:
+    """Build a server-sent event frame with a properly escaped JSON payload"""
+    return _FRAME_PREFIX + _json_bytes(payload) + _FRAME_SUFFIX
+
+# Fixed frames, built once
+_COMPLETE_FRAME = _sse_frame({"type": "complete"})
+_STREAM_INTERRUPTED_FRAME = _sse_frame({"type": "error", "message": "Stream interrupted"})
+_QUERY_FAILED_FRAME = _sse_frame({"type": "error", "message": "Query processing failed. Please try again."})
+
+# Text frames only vary in their content string, so just that is serialized per frame
+_TEXT_FRAME_PREFIX = _FRAME_PREFIX + b'{"type":"text","content":'
+_TEXT_FRAME_SUFFIX = b"}" + _FRAME_SUFFIX
+
+def _sse_text_frame(content: str) -> bytes:
+    return _TEXT_FRAME_PREFIX + _json_bytes(content) + _TEXT_FRAME_SUFFIX
+
 app = FastAPI(
     title="GenAI E-commerce Agent",
     description="An intelligent e-commerce analytics agent powered by Gemini 2.5",
     version="1.0.0",
-    debug=settings.debug
+    debug=settings.debug,
+    default_response_class=DefaultResponse
 )
 
 # Add CORS middleware with more secure settings
@@ -52,56 +119,167 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress textual responses (JSON, CSV, schema, sample data); responses that
+# already set Content-Encoding and SSE streams are passed through untouched
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Brotli quality for JSON exports: well above gzip's ratio at similar speed
+BROTLI_QUALITY = 4
+
+def _accepts_brotli(request: Request) -> bool:
+    return brotli is not None and "br" in request.headers.get("accept-encoding", "")
+
+def _error_payload(error: str, error_type: str, details: Optional[str]) -> Dict[str, Any]:
+    """Build an error body in the ErrorResponse shape without model validation"""
+    return {
+        "error": error,
+        "error_type": error_type,
+        "details": details,
+        "timestamp": _now_iso()
+    }
+
 # Global exception handlers
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors"""
-    logger.warning(f"Validation error for {request.url}: {exc}")
-    return JSONResponse(
+    logger.warning("Validation error for %s: %s", request.url, exc)
+    return DefaultResponse(
         status_code=422,
-        content=ErrorResponse(
-            error="Validation Error",
-            error_type="validation_error",
-            details=str(exc),
-            timestamp=datetime.now().isoformat()
-        ).dict()
+        content=_error_payload("Validation Error", "validation_error", str(exc))
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions"""
-    logger.error(f"Unhandled exception for {request.url}: {exc}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unhandled exception for %s: %s", request.url, exc, exc_info=True)
+    return DefaultResponse(
         status_code=500,
-        content=ErrorResponse(
-            error="Internal Server Error",
-            error_type="server_error",
-            details="An unexpected error occurred" if not settings.debug else str(exc),
-            timestamp=datetime.now().isoformat()
-        ).dict()
+        content=_error_payload(
+            "Internal Server Error",
+            "server_error",
+            "An unexpected error occurred" if not settings.debug else str(exc)
+        )
     )
 
-# Initialize handlers with error handling
-try:
-    llm_handler = LLMHandler()
-    logger.info("✅ LLM Handler initialized successfully")
-except Exception as e:
-    logger.error(f"❌ Failed to initialize LLM Handler: {e}")
-    raise
+# Handlers are created by the init_handlers startup event so that importing
+# the app (and booting each worker process) stays cheap; None until then
+llm_handler: Optional[LLMHandler] = None
+db_handler: Optional[DatabaseHandler] = None
+visualizer: Optional["DataVisualizer"] = None
 
-try:
-    db_handler = DatabaseHandler()
-    logger.info("✅ Database Handler initialized successfully")
-except Exception as e:
-    logger.error(f"❌ Failed to initialize Database Handler: {e}")
-    raise
+def _create_handler(name: str, factory):
+    """Construct a handler, logging the outcome"""
+    try:
+        handler = factory()
+        logger.info("✅ %s initialized successfully", name)
+        return handler
+    except Exception as e:
+        logger.error("❌ Failed to initialize %s: %s", name, e)
+        raise
 
-try:
-    visualizer = DataVisualizer()
-    logger.info("✅ Data Visualizer initialized successfully")
-except Exception as e:
-    logger.error(f"❌ Failed to initialize Data Visualizer: {e}")
-    raise
+def _new_visualizer() -> "DataVisualizer":
+    """Build the visualizer, deferring its pandas/NumPy/Plotly imports until startup"""
+    from app.visualizer import DataVisualizer
+    return DataVisualizer()
+
+# How long query results are reused for repeat questions (seconds)
+RESULT_CACHE_TTL = 300
+
+# Cache contexts for the SQL+data result of a question and the full /query response
+_RESULT_CACHE_CONTEXT = (("type", "query_result"),)
+
+def _response_cache_context(include_visualization: bool):
+    return (("type", "query_response"), ("visualization", include_visualization))
+
+async def _get_sql_and_data(query: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Generate, validate and execute SQL for a natural language query
+
+    Results are cached for RESULT_CACHE_TTL seconds and shared by /query,
+    /query-stream and the export endpoints. The returned rows are shared
+    between requests and must not be mutated.
+    """
+    cached = query_cache.get(query, _RESULT_CACHE_CONTEXT)
+    if cached is not None:
+        logger.info("Using cached result for query: %s...", query[:50])
+        return cached
+
+    # Generate SQL query using LLM
+    sql_query = await llm_handler.generate_sql(query)
+    logger.info("Generated SQL: %s", sql_query)
+
+    # Validate SQL query for security
+    validate_sql_query(sql_query)
+
+    # Execute SQL query
+    data = await asyncio.to_thread(db_handler.execute_query, sql_query)
+    logger.info("Query returned %s records", len(data) if data else 0)
+
+    query_cache.set(query, (sql_query, data), _RESULT_CACHE_CONTEXT, ttl=RESULT_CACHE_TTL)
+    return sql_query, data
+
+# Maximum number of live result_id handles. They are kept apart from
+# query_cache so that the SQL, response and result entries every /query
+# writes there cannot LRU-evict a handle before its TTL.
+RESULT_HANDLE_LIMIT = 4096
+
+# Results handed out to clients as a result_id; entries share the row lists
+# held by query_cache rather than copying them
+_result_handles = SimpleCache(max_size=RESULT_HANDLE_LIMIT, default_ttl=RESULT_CACHE_TTL)
+
+def _store_result(query: str, sql_query: str, data: List[Dict[str, Any]]) -> str:
+    """Keep a query result for RESULT_CACHE_TTL seconds and return a new handle to it"""
+    result_id = uuid.uuid4().hex
+    _result_handles.set(result_id, (query, sql_query, data))
+    return result_id
+
+def _load_result(result_id: str) -> Tuple[str, str, List[Dict[str, Any]]]:
+    """Look up a stored result, raising 404 once it has expired"""
+    result = _result_handles.get(result_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Result not found or expired. Please run the query again.")
+    return result
+
+@app.on_event("startup")
+async def configure_default_executor():
+    """Size the threadpool used by asyncio.to_thread for blocking DB calls"""
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=max_workers))
+
+@app.on_event("startup")
+async def init_handlers():
+    """Validate the environment and build the handlers in parallel worker threads"""
+    global llm_handler, db_handler, visualizer
+
+    if not validate_environment():
+        raise RuntimeError("Environment validation failed. Please check your configuration.")
+
+    llm_handler, db_handler, visualizer = await asyncio.gather(
+        asyncio.to_thread(_create_handler, "LLM Handler", LLMHandler),
+        asyncio.to_thread(_create_handler, "Database Handler", DatabaseHandler),
+        asyncio.to_thread(_create_handler, "Data Visualizer", _new_visualizer)
+    )
+
+def _is_ready() -> bool:
+    return llm_handler is not None and db_handler is not None and visualizer is not None
+
+@app.on_event("startup")
+async def start_timestamp_refresh():
+    """Keep the cached response timestamp current"""
+    app.state.timestamp_task = asyncio.create_task(_refresh_timestamp())
+
+@app.on_event("shutdown")
+async def stop_timestamp_refresh():
+    task = getattr(app.state, "timestamp_task", None)
+    if task:
+        task.cancel()
+
+@app.on_event("shutdown")
+async def close_handlers():
+    """Release the database connection and the visualization thread"""
+    if db_handler is not None:
+        db_handler.close()
+    _viz_executor.shutdown(wait=False)
 
 @app.get("/")
 async def root():
@@ -110,81 +288,170 @@ async def root():
         "message": "GenAI E-commerce Agent API",
         "version": "1.0.0",
         "status": "running",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso()
     }
 
-@app.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Enhanced health check endpoint"""
-    db_status = db_handler.is_connected()
+# Seconds an LLM probe result is reused by /health before probing again
+LLM_HEALTH_TTL = 30
+_llm_health = {"ok": True, "checked_at": None}
 
-    # Test LLM connection
-    llm_status = True
+async def _probe_llm() -> bool:
+    """Send a tiny request to the LLM and remember whether it succeeded"""
     try:
         # Simple test to verify LLM is accessible
         await llm_handler.model.generate_content_async("test")
-    except:
-        llm_status = False
-
+        ok = True
+    except Exception:
+        ok = False
+    _llm_health["ok"] = ok
+    _llm_health["checked_at"] = time.monotonic()
+    return ok
+
+def _health_response(db_status: bool, llm_status: bool) -> HealthResponse:
     return HealthResponse(
         status="healthy" if db_status and llm_status else "degraded",
         database=db_status,
         llm=llm_status,
-        timestamp=datetime.now().isoformat()
+        timestamp=_now_iso()
     )
 
+def _starting_response() -> HealthResponse:
+    return HealthResponse(status="starting", database=False, llm=False, timestamp=_now_iso())
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 200 once the handlers are initialized, 503 before"""
+    if not _is_ready():
+        return DefaultResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
+
+@app.get("/health", response_model=HealthResponse)
+async def health_check():
+    """Enhanced health check endpoint (LLM status is re-probed at most every LLM_HEALTH_TTL seconds)"""
+    if not _is_ready():
+        return _starting_response()
+
+    db_status = await asyncio.to_thread(db_handler.is_connected)
+
+    checked_at = _llm_health["checked_at"]
+    if checked_at is not None and time.monotonic() - checked_at < LLM_HEALTH_TTL:
+        llm_status = _llm_health["ok"]
+    else:
+        llm_status = await _probe_llm()
+
+    return _health_response(db_status, llm_status)
+
+@app.get("/health/deep", response_model=HealthResponse)
+async def deep_health_check():
+    """Health check that always probes the LLM"""
+    if not _is_ready():
+        return _starting_response()
+
+    db_status = await asyncio.to_thread(db_handler.is_connected)
+    llm_status = await _probe_llm()
+    return _health_response(db_status, llm_status)
+
+# Pipelines currently running, keyed by the /query response cache key,
+# so identical concurrent requests share one LLM+DB round-trip
+_inflight: Dict[str, "asyncio.Future[QueryResponse]"] = {}
+
+# Single worker so matplotlib's global pyplot state is never used from two threads at once
+_viz_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="viz")
+
+async def _render_visualization(data: List[Dict[str, Any]], query: str) -> Optional[str]:
+    """Build a visualization off the event loop; failures yield None"""
+    try:
+        visualization = await asyncio.get_running_loop().run_in_executor(
+            _viz_executor, visualizer.create_visualization, data, query
+        )
+        logger.info("Visualization generated successfully")
+        return visualization
+    except Exception as viz_error:
+        logger.warning("Visualization generation failed: %s", viz_error)
+        # Continue without visualization rather than failing the entire request
+        return None
+
+async def _build_query_response(query: str, include_visualization: bool) -> QueryResponse:
+    """Run the full SQL, data, response and visualization pipeline and cache the result"""
+    start_time = time.time()
+    sql_query, data = await _get_sql_and_data(query)
+
+    # Generate the natural language response and, if requested, the visualization
+    # concurrently: both depend only on the data
+    if include_visualization and data:
+        response, visualization = await asyncio.gather(
+            llm_handler.generate_response(query, data, sql_query),
+            _render_visualization(data, query)
+        )
+    else:
+        response = await llm_handler.generate_response(query, data, sql_query)
+        visualization = None
+
+    query_response = QueryResponse(
+        response=response,
+        data=data,
+        visualization=visualization,
+        sql_query=sql_query,
+        execution_time=round(time.time() - start_time, 3),
+        record_count=len(data) if data else 0
+    )
+    query_cache.set(query, query_response, _response_cache_context(include_visualization),
+                    ttl=RESULT_CACHE_TTL)
+    return query_response
+
+def _finish_inflight(key: str, task: "asyncio.Future[QueryResponse]") -> None:
+    _inflight.pop(key, None)
+    # Mark the exception as retrieved even if every waiter has gone away
+    if not task.cancelled():
+        task.exception()
+
+async def _coalesced_query_response(query: str, include_visualization: bool) -> QueryResponse:
+    """Join the running pipeline for an identical query, or start one"""
+    key = query_cache.key_for(query, _response_cache_context(include_visualization))
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_build_query_response(query, include_visualization))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _finish_inflight(key, t))
+    else:
+        logger.info("Joining in-flight pipeline for query: %s...", query[:50])
+    # Shielded so a disconnecting client does not cancel work other waiters share
+    return await asyncio.shield(task)
+
 @app.post("/query", response_model=QueryResponse)
 async def process_query(request: QueryRequest):
     """
     Process natural language queries about e-commerce data with enhanced security and error handling
     """
     start_time = time.time()
+    response_context = _response_cache_context(request.include_visualization)
 
     try:
-        logger.info(f"Processing query: {request.query[:100]}...")
-
-        # Generate SQL query using LLM
-        sql_query = await llm_handler.generate_sql(request.query)
-        logger.info(f"Generated SQL: {sql_query}")
-
-        # Validate SQL query for security
-        validate_sql_query(sql_query)
-
-        # Execute SQL query
-        data = db_handler.execute_query(sql_query)
-        logger.info(f"Query returned {len(data) if data else 0} records")
-
-        # Generate natural language response
-        response = await llm_handler.generate_response(request.query, data, sql_query)
-
-        # Generate visualization if requested
-        visualization = None
-        if request.include_visualization and data:
-            try:
-                visualization = visualizer.create_visualization(data, request.query)
-                logger.info("Visualization generated successfully")
-            except Exception as viz_error:
-                logger.warning(f"Visualization generation failed: {viz_error}")
-                # Continue without visualization rather than failing the entire request
-
-        execution_time = time.time() - start_time
-
-        return QueryResponse(
-            response=response,
-            data=data,
-            visualization=visualization,
-            sql_query=sql_query,
-            execution_time=round(execution_time, 3),
-            record_count=len(data) if data else 0
+        logger.info("Processing query: %s...", request.query[:100])
+
+        # Return a recent identical response without any LLM or DB work
+        query_response = query_cache.get(request.query, response_context)
+        if query_response is not None:
+            logger.info("Using cached response for query: %s...", request.query[:50])
+        else:
+            query_response = await _coalesced_query_response(
+                request.query, request.include_visualization
+            )
+
+        # Each caller gets its own export handle, even for a shared cached response
+        data = query_response.data
+        result_id = _store_result(request.query, query_response.sql_query, data) if data else None
+        return query_response.model_copy(
+            update={"execution_time": round(time.time() - start_time, 3), "result_id": result_id}
         )
 
     except ValueError as e:
         # Handle validation errors
-        logger.warning(f"Validation error: {e}")
+        logger.warning("Validation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Handle other errors
-        logger.error(f"Query processing failed: {e}", exc_info=True)
+        logger.error("Query processing failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Query processing failed. Please try again or contact support."
@@ -196,16 +463,9 @@ async def process_query_stream(request: QueryRequest):
     Process natural language queries with streaming response for better UX
     """
     try:
-        logger.info(f"Processing streaming query: {request.query[:100]}...")
-
-        # Generate SQL query using LLM
-        sql_query = await llm_handler.generate_sql(request.query)
-
-        # Validate SQL query for security
-        validate_sql_query(sql_query)
+        logger.info("Processing streaming query: %s...", request.query[:100])
 
-        # Execute SQL query
-        data = db_handler.execute_query(sql_query)
+        sql_query, data = await _get_sql_and_data(request.query)
 
         # Generate natural language response
         response = await llm_handler.generate_response(request.query, data, sql_query)
@@ -213,77 +473,97 @@ async def process_query_stream(request: QueryRequest):
         async def event_generator():
             try:
                 # Send metadata first
-                yield f"data: {{\"type\": \"metadata\", \"sql\": \"{sql_query}\", \"record_count\": {len(data) if data else 0}}}\n\n"
+                yield _sse_frame({"type": "metadata", "sql": sql_query, "record_count": len(data) if data else 0})
 
-                # Stream the response character by character
-                for char in response:
-                    yield f"data: {{\"type\": \"text\", \"content\": \"{char}\"}}\n\n"
-                    await asyncio.sleep(0.03)  # Simulate typing effect
+                # Stream the response in fixed-size chunks
+                for i in range(0, len(response), STREAM_CHUNK_SIZE):
+                    yield _sse_text_frame(response[i:i + STREAM_CHUNK_SIZE])
 
                 # Send completion signal
-                yield f"data: {{\"type\": \"complete\"}}\n\n"
+                yield _COMPLETE_FRAME
 
             except Exception as e:
-                logger.error(f"Error in event generator: {e}")
-                yield f"data: {{\"type\": \"error\", \"message\": \"Stream interrupted\"}}\n\n"
+                logger.error("Error in event generator: %s", e)
+                yield _STREAM_INTERRUPTED_FRAME
 
         return StreamingResponse(event_generator(), media_type="text/event-stream")
 
     except ValueError as e:
-        logger.warning(f"Validation error in streaming query: {e}")
+        logger.warning("Validation error in streaming query: %s", e)
+        # Bind the message now: Python unbinds e when the except block exits
+        message = str(e)
         async def error_event():
-            yield f"data: {{\"type\": \"error\", \"message\": \"{str(e)}\"}}\n\n"
+            yield _sse_frame({"type": "error", "message": message})
         return StreamingResponse(error_event(), media_type="text/event-stream")
 
     except Exception as e:
-        logger.error(f"Streaming query processing failed: {e}", exc_info=True)
+        logger.error("Streaming query processing failed: %s", e, exc_info=True)
         async def error_event():
-            yield f"data: {{\"type\": \"error\", \"message\": \"Query processing failed. Please try again.\"}}\n\n"
+            yield _QUERY_FAILED_FRAME
         return StreamingResponse(error_event(), media_type="text/event-stream")
 
+# How long clients may reuse /schema and /sample-data before revalidating (seconds)
+CONDITIONAL_MAX_AGE = 60
+
+def _etag_for(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+def _conditional_json(http_request: Request, body: bytes, etag: Optional[str] = None) -> Response:
+    """Serve JSON bytes with an ETag, or an empty 304 if the client already has them"""
+    if etag is None:
+        etag = _etag_for(body)
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={CONDITIONAL_MAX_AGE}"}
+    if_none_match = http_request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# Serialized /schema body and its ETag, reused while get_schema returns the same
+# (schema_version-cached) object
+_schema_body_cache: Dict[str, Any] = {"schema": None, "body": None, "etag": None}
+
 @app.get("/schema", response_model=SchemaResponse)
-async def get_database_schema():
+async def get_database_schema(http_request: Request):
     """Get database schema information with enhanced error handling"""
     try:
         logger.info("Fetching database schema")
-        schema = db_handler.get_schema()
+        schema = await asyncio.to_thread(db_handler.get_schema)
 
         if not schema:
             raise HTTPException(status_code=404, detail="No database schema found")
 
-        return SchemaResponse(
-            schema=schema,
-            table_count=len(schema)
-        )
+        if _schema_body_cache["schema"] is not schema:
+            body = _json_bytes({"schema": schema, "table_count": len(schema)})
+            _schema_body_cache.update(schema=schema, body=body, etag=_etag_for(body))
+
+        return _conditional_json(http_request, _schema_body_cache["body"], _schema_body_cache["etag"])
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get database schema: {e}", exc_info=True)
+        logger.error("Failed to get database schema: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to retrieve database schema")
 
 @app.get("/sample-data", response_model=SampleDataResponse)
-async def get_sample_data(table_name: Optional[str] = None, limit: int = 5):
+async def get_sample_data(http_request: Request, table_name: Optional[str] = None, limit: int = 5):
     """Get sample data from the database with enhanced error handling"""
     try:
-        logger.info(f"Fetching sample data for table: {table_name or 'all tables'}")
+        logger.info("Fetching sample data for table: %s", table_name or 'all tables')
 
         # Validate limit
         if limit < 1 or limit > 100:
             raise HTTPException(status_code=400, detail="Limit must be between 1 and 100")
 
-        sample_data = db_handler.get_sample_data(table_name, limit)
+        sample_data = await asyncio.to_thread(db_handler.get_sample_data, table_name, limit)
 
         if not sample_data:
             raise HTTPException(status_code=404, detail="No sample data found")
 
-        return SampleDataResponse(
-            sample_data=sample_data,
-            tables=list(sample_data.keys())
-        )
+        body = _json_bytes({"sample_data": sample_data, "tables": list(sample_data.keys())})
+        return _conditional_json(http_request, body)
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get sample data: {e}", exc_info=True)
+        logger.error("Failed to get sample data: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to retrieve sample data")
 
 @app.get("/cache/stats")
@@ -296,7 +576,7 @@ async def get_cache_stats():
             "status": "healthy"
         }
     except Exception as e:
-        logger.error(f"Failed to get cache stats: {e}")
+        logger.error("Failed to get cache stats: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve cache statistics")
 
 @app.post("/cache/clear")
@@ -306,120 +586,148 @@ async def clear_cache():
         query_cache.clear()
         return {"message": "Cache cleared successfully"}
     except Exception as e:
-        logger.error(f"Failed to clear cache: {e}")
+        logger.error("Failed to clear cache: %s", e)
         raise HTTPException(status_code=500, detail="Failed to clear cache")
 
 @app.post("/cache/cleanup")
 async def cleanup_cache():
     """Remove expired cache entries"""
     try:
-        removed_count = query_cache.cleanup_expired()
+        removed_count = query_cache.cleanup_expired() + _result_handles.cleanup_expired()
         return {
-            "message": f"Cache cleanup completed",
+            "message": "Cache cleanup completed",
             "removed_entries": removed_count
         }
     except Exception as e:
-        logger.error(f"Failed to cleanup cache: {e}")
+        logger.error("Failed to cleanup cache: %s", e)
         raise HTTPException(status_code=500, detail="Failed to cleanup cache")
 
+# Buffered CSV bytes are flushed to the client once they exceed this size
+CSV_STREAM_CHUNK_SIZE = 64 * 1024
+
+def _iter_csv(data: List[Dict[str, Any]]):
+    """Encode rows as CSV, yielding chunks so the full file is never buffered"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=data[0].keys())
+    writer.writeheader()
+    for row in data:
+        writer.writerow(row)
+        if buffer.tell() > CSV_STREAM_CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def _export_filename(extension: str) -> str:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"ecommerce_data_{timestamp}.{extension}"
+
+def _csv_export_response(data: List[Dict[str, Any]]) -> StreamingResponse:
+    """Stream rows as a CSV attachment"""
+    return StreamingResponse(
+        _iter_csv(data),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={_export_filename('csv')}"}
+    )
+
+def _json_export_response(query: str, sql_query: str, data: List[Dict[str, Any]],
+                          http_request: Request) -> Response:
+    """Build a JSON attachment with metadata, brotli-compressed when the client accepts it"""
+    # Create JSON export with metadata
+    export_data = {
+        "metadata": {
+            "query": query,
+            "sql_query": sql_query,
+            "export_timestamp": _now_iso(),
+            "record_count": len(data)
+        },
+        "data": data
+    }
+
+    json_content = _json_bytes(export_data, indent=True)
+
+    headers = {"Content-Disposition": f"attachment; filename={_export_filename('json')}"}
+    if _accepts_brotli(http_request):
+        json_content = brotli.compress(json_content, quality=BROTLI_QUALITY)
+        headers["Content-Encoding"] = "br"
+        headers["Vary"] = "Accept-Encoding"
+
+    return Response(
+        content=json_content,
+        media_type="application/json",
+        headers=headers
+    )
+
 @app.post("/export/csv")
 async def export_data_csv(request: QueryRequest):
     """Export query results as CSV file"""
     try:
-        logger.info(f"Exporting CSV for query: {request.query[:50]}...")
-
-        # Generate SQL query using LLM
-        sql_query = await llm_handler.generate_sql(request.query)
+        logger.info("Exporting CSV for query: %s...", request.query[:50])
 
-        # Validate SQL query for security
-        validate_sql_query(sql_query)
-
-        # Execute SQL query
-        data = db_handler.execute_query(sql_query)
+        sql_query, data = await _get_sql_and_data(request.query)
 
         if not data:
             raise HTTPException(status_code=404, detail="No data found for the query")
 
-        # Create CSV content
-        output = io.StringIO()
-        if data:
-            fieldnames = data[0].keys()
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data)
-
-        csv_content = output.getvalue()
-        output.close()
-
-        # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"ecommerce_data_{timestamp}.csv"
-
-        return Response(
-            content=csv_content,
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
+        return _csv_export_response(data)
 
+    except HTTPException:
+        raise
     except ValueError as e:
-        logger.warning(f"Validation error in CSV export: {e}")
+        logger.warning("Validation error in CSV export: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"CSV export failed: {e}", exc_info=True)
+        logger.error("CSV export failed: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to export data as CSV")
 
+@app.get("/export/csv/{result_id}")
+async def export_result_csv(result_id: str):
+    """Export a result returned by /query as CSV without re-running it"""
+    _, _, data = _load_result(result_id)
+    return _csv_export_response(data)
+
 @app.post("/export/json")
-async def export_data_json(request: QueryRequest):
+async def export_data_json(request: QueryRequest, http_request: Request):
     """Export query results as JSON file"""
     try:
-        logger.info(f"Exporting JSON for query: {request.query[:50]}...")
-
-        # Generate SQL query using LLM
-        sql_query = await llm_handler.generate_sql(request.query)
-
-        # Validate SQL query for security
-        validate_sql_query(sql_query)
+        logger.info("Exporting JSON for query: %s...", request.query[:50])
 
-        # Execute SQL query
-        data = db_handler.execute_query(sql_query)
+        sql_query, data = await _get_sql_and_data(request.query)
 
         if not data:
             raise HTTPException(status_code=404, detail="No data found for the query")
 
-        # Create JSON export with metadata
-        export_data = {
-            "metadata": {
-                "query": request.query,
-                "sql_query": sql_query,
-                "export_timestamp": datetime.now().isoformat(),
-                "record_count": len(data)
-            },
-            "data": data
-        }
-
-        json_content = json.dumps(export_data, indent=2, default=str)
-
-        # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"ecommerce_data_{timestamp}.json"
-
-        return Response(
-            content=json_content,
-            media_type="application/json",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
+        return _json_export_response(request.query, sql_query, data, http_request)
 
+    except HTTPException:
+        raise
     except ValueError as e:
-        logger.warning(f"Validation error in JSON export: {e}")
+        logger.warning("Validation error in JSON export: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"JSON export failed: {e}", exc_info=True)
+        logger.error("JSON export failed: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to export data as JSON")
 
+@app.get("/export/json/{result_id}")
+async def export_result_json(result_id: str, http_request: Request):
+    """Export a result returned by /query as JSON without re-running it"""
+    query, sql_query, data = _load_result(result_id)
+    return _json_export_response(query, sql_query, data, http_request)
+
 if __name__ == "__main__":
+    # Auto-reload only works with a single process, so debug runs one worker.
+    # Each worker process has its own DB connection and in-memory caches.
+    workers = 1 if settings.debug else (settings.workers or os.cpu_count() or 1)
     uvicorn.run(
         "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
-    )
\ No newline at end of file
+        host=settings.host,
+        port=settings.port,
+        reload=settings.debug,
+        workers=workers,
+        loop="uvloop" if uvloop else "auto",
+        http="auto",  # httptools when installed, otherwise h11
+        backlog=2048,
+        timeout_keep_alive=settings.timeout_keep_alive,
+        log_level=settings.log_level.lower()
+    )
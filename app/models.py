@@ -1,10 +1,28 @@
 """
 Pydantic models for request/response validation
 """
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Dict, Any, Optional
 import re
 
+# Keywords rejected anywhere in a natural language query (substring match)
+_DANGEROUS_QUERY_KEYWORDS = [
+    'DROP', 'DELETE', 'INSERT', 'UPDATE', 'ALTER', 'CREATE', 
+    'TRUNCATE', 'EXEC', 'EXECUTE', 'UNION', '--', ';'
+]
+_DANGEROUS_QUERY_RE = re.compile('|'.join(re.escape(k) for k in _DANGEROUS_QUERY_KEYWORDS))
+
+# Statements rejected in generated SQL, checked against its word tokens
+_DANGEROUS_SQL_WORDS = frozenset({
+    'DROP', 'DELETE', 'INSERT', 'UPDATE', 'ALTER', 'CREATE',
+    'TRUNCATE', 'EXEC', 'EXECUTE'
+})
+_SQL_WORD_RE = re.compile(r'\w+')
+
+# Dangerous constructs in generated SQL, matched against the upper-cased query
+# in a single pass; the first non-empty group names the hit
+_DANGEROUS_SQL_RE = re.compile(r'(--)|(;).*SELECT|(UNION).*SELECT')
+
 class QueryRequest(BaseModel):
     """Request model for natural language queries"""
     query: str = Field(
@@ -18,24 +36,19 @@ class QueryRequest(BaseModel):
         description="Whether to generate a visualization for the query"
     )
     
-    @validator('query')
-    def validate_query(cls, v):
+    @field_validator('query')
+    @classmethod
+    def validate_query(cls, v: str) -> str:
         # Remove extra whitespace
         v = v.strip()
         
         # Check for potentially dangerous SQL keywords
-        dangerous_keywords = [
-            'DROP', 'DELETE', 'INSERT', 'UPDATE', 'ALTER', 'CREATE', 
-            'TRUNCATE', 'EXEC', 'EXECUTE', 'UNION', '--', ';'
-        ]
-        
-        query_upper = v.upper()
-        for keyword in dangerous_keywords:
-            if keyword in query_upper:
-                raise ValueError(
-                    f"Query contains potentially dangerous keyword: {keyword}. "
-                    "Only SELECT queries are allowed."
-                )
+        match = _DANGEROUS_QUERY_RE.search(v.upper())
+        if match:
+            raise ValueError(
+                f"Query contains potentially dangerous keyword: {match.group(0)}. "
+                "Only SELECT queries are allowed."
+            )
         
         # Basic validation for meaningful content
         if len(v.split()) < 2:
@@ -52,7 +65,7 @@ class QueryResponse(BaseModel):
     )
     visualization: Optional[str] = Field(
         default=None, 
-        description="Base64 encoded visualization image"
+        description="Interactive chart as an HTML page, or a PNG data URI for static charts"
     )
     sql_query: Optional[str] = Field(
         default=None, 
@@ -66,6 +79,10 @@ class QueryResponse(BaseModel):
         default=None,
         description="Number of records returned"
     )
+    result_id: Optional[str] = Field(
+        default=None,
+        description="Handle for exporting these results via GET /export/{csv,json}/{result_id}"
+    )
 
 class ErrorResponse(BaseModel):
     """Error response model"""
@@ -126,15 +143,15 @@ def validate_sql_query(sql: str) -> bool:
         raise ValueError("Only SELECT queries are allowed")
     
     # Check for dangerous keywords
-    dangerous_patterns = [
-        r'\bDROP\b', r'\bDELETE\b', r'\bINSERT\b', r'\bUPDATE\b',
-        r'\bALTER\b', r'\bCREATE\b', r'\bTRUNCATE\b', r'\bEXEC\b',
-        r'\bEXECUTE\b', r'--', r';.*SELECT', r'UNION.*SELECT'
-    ]
+    dangerous = _DANGEROUS_SQL_WORDS.intersection(_SQL_WORD_RE.findall(sql_upper))
+    if dangerous:
+        raise ValueError(f"SQL query contains dangerous pattern: {', '.join(sorted(dangerous))}")
     
-    for pattern in dangerous_patterns:
-        if re.search(pattern, sql_upper):
-            raise ValueError(f"SQL query contains dangerous pattern: {pattern}")
+    # Check for dangerous constructs
+    match = _DANGEROUS_SQL_RE.search(sql_upper)
+    if match:
+        pattern = next(group for group in match.groups() if group)
+        raise ValueError(f"SQL query contains dangerous pattern: {pattern}")
     
     # Check for multiple statements (basic check)
     if sql.count(';') > 1 or (sql.count(';') == 1 and not sql.strip().endswith(';')):
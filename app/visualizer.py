@@ -1,28 +1,408 @@
-import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
 import io
 import base64
+import hashlib
+import importlib.util
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Literal, Callable, TYPE_CHECKING
 import numpy as np
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import fast_histogram
+except ImportError:  # pragma: no cover - optional speedup
+    fast_histogram = None
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
 logger = logging.getLogger(__name__)
 
-class DataVisualizer:
-    def __init__(self):
-        """Initialize the enhanced data visualizer with Plotly support"""
+# matplotlib/seaborn, plotly.express and numba are slow to import and each is
+# only needed by one family of charts, so they are loaded on first use
+_pyplot = None
+_plotly_express = None
+_compiled_bin_counts = None
+
+# numba is an optional speedup; probe for it without importing it
+_HAS_NUMBA = importlib.util.find_spec("numba") is not None
+
+def _plt():
+    """Import matplotlib.pyplot, configured for headless rendering, on first use"""
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as pyplot
+        import seaborn as sns
+
         # Set style for better-looking plots
-        plt.style.use('default')
+        pyplot.style.use('default')
         sns.set_palette("husl")
+        _pyplot = pyplot
+    return _pyplot
+
+def _px():
+    """Import plotly.express on first use"""
+    global _plotly_express
+    if _plotly_express is None:
+        import plotly.express
+        _plotly_express = plotly.express
+    return _plotly_express
+
+# Above this many points, scatter traces are drawn with WebGL instead of SVG
+WEBGL_THRESHOLD = 5000
+
+# Line and scatter data beyond this many points is downsampled before plotting
+MAX_PLOT_POINTS = 10000
+
+# Number of rendered charts remembered per visualizer
+CHART_CACHE_SIZE = 128
+
+def _data_digest(data: List[Dict[str, Any]]) -> bytes:
+    """Fingerprint the full result rows (orjson when available)"""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY, default=str)
+    else:
+        payload = json.dumps(data, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+# zlib level for static PNG charts: much faster than the default 6 for slightly larger files
+PNG_COMPRESS_LEVEL = 1
+
+# Number of bins used by all histogram paths
+HISTOGRAM_BINS = 20
+
+# From this many rows, the summary dashboard's per-panel aggregations run on
+# a short-lived thread pool; below it, thread start-up costs more than they take
+SUMMARY_PARALLEL_MIN_ROWS = 100_000
+
+def _run_aggregations(tasks: Dict[str, tuple], parallel: bool) -> Dict[str, Any]:
+    """
+    Run independent (function, *args) tasks and return their results by name
+
+    In parallel mode each task gets a worker of a pool that is shut down on
+    return; only pandas/NumPy work runs there, since pyplot is not thread-safe.
+    """
+    if not parallel:
+        return {name: fn(*args) for name, (fn, *args) in tasks.items()}
+    with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="summary") as ex:
+        futures = {name: ex.submit(fn, *args) for name, (fn, *args) in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+def _bin_counts_kernel(a: np.ndarray, lo: float, hi: float, bins: int) -> np.ndarray:
+    """Count values into equal-width bins in one pass (compiled by _bin_counts)"""
+    inv = bins / (hi - lo)
+    counts = np.zeros(bins, np.int64)
+    for i in range(a.size):
+        idx = int((a[i] - lo) * inv)
+        if idx == bins:
+            idx -= 1
+        counts[idx] += 1
+    return counts
+
+def _bin_counts(a: np.ndarray, lo: float, hi: float, bins: int) -> np.ndarray:
+    """Run the bin counter, importing numba and compiling it on first use"""
+    global _compiled_bin_counts
+    if _compiled_bin_counts is None:
+        from numba import njit
+        _compiled_bin_counts = njit(cache=True)(_bin_counts_kernel)
+    return _compiled_bin_counts(a, lo, hi, bins)
+
+def _numeric_array(df: pd.DataFrame, cols: List[str]) -> np.ndarray:
+    """
+    The given numeric columns as one float32 array, with missing values as NaN
+
+    float32 is ample for binning and counting, and halves the bytes scanned.
+    """
+    return df[cols].to_numpy(dtype=np.float32, na_value=np.nan)
+
+def _histogram(values, bins: int = HISTOGRAM_BINS):
+    """
+    Bin a numeric column into equal-width bins, ignoring missing values
+
+    Uses fast-histogram's C uniform-bin counter when installed, then a
+    Numba-compiled single-pass counter, then np.histogram; all match
+    np.histogram's bin edges.
+
+    Args:
+        values: A numeric Series (binned in float32), or a float array with
+            missing values as NaN
+
+    Returns:
+        tuple: (counts, edges) arrays of length bins and bins + 1
+    """
+    if isinstance(values, pd.Series):
+        values = values.to_numpy(dtype=np.float32, na_value=np.nan)
+    a = values[~np.isnan(values)]
+    if (fast_histogram is None and not _HAS_NUMBA) or a.size == 0:
+        return np.histogram(a, bins=bins)
+    lo, hi = float(a.min()), float(a.max())
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    edges = np.linspace(lo, hi, bins + 1)
+    if fast_histogram is not None:
+        # Its range is half-open, so count values equal to the maximum into the
+        # last bin as np.histogram does (widening the range would shift the
+        # values that sit exactly on the inner edges into the bin below)
+        counts = fast_histogram.histogram1d(a, bins=bins, range=(lo, hi)).astype(np.int64)
+        counts[-1] += np.count_nonzero(a == hi)
+        return counts, edges
+    return _bin_counts(a, lo, hi, bins), edges
+
+def _fast_corr(df: pd.DataFrame, cols: List[str]) -> pd.DataFrame:
+    """
+    Pearson correlation matrix of the given columns via one np.corrcoef call
+
+    Computed in float32 on a contiguous array; columns with missing values
+    fall back to DataFrame.corr(), which uses pairwise-complete observations.
+    """
+    arr = np.ascontiguousarray(df[cols].to_numpy(dtype=np.float32, na_value=np.nan))
+    if np.isnan(arr).any():
+        return df[cols].corr()
+    corr = np.corrcoef(arr, rowvar=False, dtype=np.float32)
+    return pd.DataFrame(corr, index=cols, columns=cols)
+
+def _top_values(values: pd.Series, n: int) -> pd.Series:
+    """
+    The n most frequent non-missing values and their counts, like value_counts().head(n)
+
+    Each value is hashed once by pd.factorize; counting then works on the
+    integer codes with np.bincount. Ties keep first-appearance order.
+    """
+    codes, uniques = pd.factorize(values)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    top = np.argsort(-counts, kind='stable')[:n]
+    return pd.Series(counts[top], index=uniques.take(top), name='count')
+
+def _missing_counts(df: pd.DataFrame, numeric_cols: List[str],
+                    numeric_arr: Optional[np.ndarray] = None) -> pd.Series:
+    """
+    Missing values per column, in column order
+
+    Numeric columns are counted with one np.isnan pass over a float array
+    (numeric_arr, from _numeric_array, if the caller already has it); only
+    the remaining columns go through isna(), one column at a time.
+    """
+    counts = pd.Series(0, index=df.columns, dtype=np.int64)
+    if numeric_cols:
+        if numeric_arr is None:
+            numeric_arr = _numeric_array(df, numeric_cols)
+        counts[numeric_cols] = np.isnan(numeric_arr).sum(axis=0)
+    numeric = set(numeric_cols)
+    for col in df.columns:
+        if col not in numeric:
+            counts[col] = df[col].isna().sum()
+    return counts
+
+def _first_column_values(df: pd.DataFrame) -> np.ndarray:
+    """First column as a raw array for fallback charts (ones if there are no columns)"""
+    if len(df.columns) == 0:
+        return np.ones(len(df))
+    return df[df.columns[0]].to_numpy(copy=False)
+
+def _df_from_records(data: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Build a DataFrame from row dicts by pivoting them to columns first
+
+    Passing whole columns lets pandas infer each dtype once instead of going
+    through its per-row dict handling. Columns follow the first row's keys
+    (query results all share them); missing values become None.
+    """
+    keys = data[0].keys()
+    return pd.DataFrame({key: [row.get(key) for row in data] for key in keys})
+
+def _sorted_by_time(df: pd.DataFrame, x_col: str) -> pd.DataFrame:
+    """
+    Convert a date column to datetime64 (if possible) and sort by it
+
+    Already-typed columns skip parsing; text is parsed with the vectorized
+    ISO 8601 parser. Columns that do not parse are left unchanged and unsorted.
+    """
+    if df[x_col].dtype.kind != 'M':
+        try:
+            converted = pd.to_datetime(df[x_col], format='ISO8601', cache=True)
+        except (ValueError, TypeError):
+            return df
+        df = df.assign(**{x_col: converted})
+    return df.sort_values(x_col, kind='stable')
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Pick the points of a series to keep with Largest-Triangle-Three-Buckets
+
+    The first and last points are always kept; every bucket in between keeps
+    the point forming the largest triangle with the previously kept point and
+    the average of the next bucket, which preserves peaks and troughs.
+
+    Args:
+        x: Sorted numeric x values
+        y: Numeric y values
+        n_out: Number of points to keep
+
+    Returns:
+        np.ndarray: Increasing indices of the kept points
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    bucket_size = (n - 2) / (n_out - 2)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        indices[i + 1] = a
+    return indices
+
+def _axis_values(series: pd.Series) -> np.ndarray:
+    """Numeric positions of an axis column for downsampling (row order for text)"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(np.float64)
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.arange(len(series), dtype=np.float64)
+
+def _downsample_line(df: pd.DataFrame, x_col: str, y_col: str, n_target: int = MAX_PLOT_POINTS) -> pd.DataFrame:
+    """Reduce a sorted line series to n_target visually representative points"""
+    if len(df) <= n_target:
+        return df
+    keep = _lttb_indices(_axis_values(df[x_col]), _axis_values(df[y_col]), n_target)
+    return df.iloc[keep]
+
+def _downsample_scatter(df: pd.DataFrame, n_target: int = MAX_PLOT_POINTS) -> pd.DataFrame:
+    """Uniformly sample scatter rows (deterministically, so charts are reproducible)"""
+    if len(df) <= n_target:
+        return df
+    keep = np.random.default_rng(0).choice(len(df), size=n_target, replace=False)
+    keep.sort()
+    return df.iloc[keep]
+
+# Minimal page for a Plotly figure, loading the same plotly.js version as pio.to_html's CDN mode
+_PLOTLY_CDN_URL = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+_PLOTLY_HTML_HEAD = (
+    '<html><head><meta charset="utf-8" /></head><body>'
+    '<div id="plotly-chart" style="height:100%; width:100%;"></div>'
+    f'<script charset="utf-8" src="{_PLOTLY_CDN_URL}"></script>'
+    '<script type="text/javascript">var fig = '
+)
+_PLOTLY_HTML_TAIL = (
+    ';Plotly.newPlot("plotly-chart", fig.data, fig.layout, {"responsive": true});'
+    '</script></body></html>'
+)
+
+def _figure_html(fig: go.Figure) -> str:
+    """Render a figure as a standalone HTML page (orjson-encoded when available)"""
+    if orjson is None:
+        return pio.to_html(fig, include_plotlyjs='cdn', div_id="plotly-chart")
+    fig_json = pio.to_json(fig, validate=False, engine="orjson")
+    # Keep the JSON from closing the script element early
+    return _PLOTLY_HTML_HEAD + fig_json.replace("</", "<\\/") + _PLOTLY_HTML_TAIL
+
+# Query keywords (substring matches) mapped to chart types, in priority order
+_VIZ_KEYWORDS = [
+    # Advanced visualizations
+    ('heatmap', ['heatmap', 'heat map', 'correlation matrix']),
+    ('treemap', ['treemap', 'tree map', 'hierarchy']),
+    ('funnel', ['funnel', 'conversion']),
+    ('gauge', ['gauge', 'meter', 'kpi']),
+    ('box_plot', ['box plot', 'boxplot', 'quartile']),
+    ('violin_plot', ['violin plot', 'violinplot', 'density']),
+    # Time-based queries
+    ('line_chart', ['trend', 'over time', 'daily', 'monthly', 'yearly', 'date']),
+    # Comparison queries
+    ('bar_chart', ['compare', 'vs', 'versus', 'top', 'best', 'worst']),
+    # Distribution queries
+    ('pie_chart', ['distribution', 'percentage', 'proportion', 'share']),
+    # Correlation queries
+    ('scatter_plot', ['correlation', 'relationship', 'scatter']),
+]
+# One case-insensitive alternation per chart type, so each group is a single C-level scan
+_VIZ_KEYWORD_PATTERNS = [
+    (re.compile('|'.join(re.escape(k) for k in keywords), re.IGNORECASE), viz_type)
+    for viz_type, keywords in _VIZ_KEYWORDS
+]
+
+# Column name fragments that mark a date/time column
+_DATE_KEYWORDS = ('date', 'time', 'created', 'updated')
+
+@dataclass
+class _ColProfile:
+    """Column names of a DataFrame grouped by role, computed once per chart"""
+    numeric: List[str]
+    categorical: List[str]
+    date: List[str]
+
+def _column_profile(df: pd.DataFrame) -> _ColProfile:
+    """Classify columns in a single pass over the dtypes (same rules as select_dtypes)"""
+    numeric, categorical, date = [], [], []
+    for col, dtype in df.dtypes.items():
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            numeric.append(col)
+        elif dtype == object:
+            categorical.append(col)
+        if any(keyword in col.lower() for keyword in _DATE_KEYWORDS):
+            date.append(col)
+    return _ColProfile(numeric=numeric, categorical=categorical, date=date)
+
+def _fast_group_sum(df: pd.DataFrame, key: str, val: str, as_index: bool = False):
+    """
+    Sum a numeric column per group without sorting the groups
+
+    Groups keep their first-appearance order (i.e. the SQL result order), and
+    unused categories of categorical keys are skipped.
+
+    Args:
+        df: DataFrame containing the data
+        key: Column to group by
+        val: Numeric column to sum
+        as_index: Return a Series indexed by group instead of a two-column DataFrame
+    """
+    return df.groupby(key, sort=False, observed=True, as_index=as_index)[val].sum()
 
-        # Configure matplotlib for non-interactive backend
-        plt.switch_backend('Agg')
+class DataVisualizer:
+    def __init__(self, dpi: int = 100):
+        """
+        Initialize the enhanced data visualizer with Plotly support
+
+        Args:
+            dpi: Resolution of static (matplotlib) PNG charts
+        """
+        # Static charts are drawn on one reused figure, outside pyplot's figure
+        # registry; created by the first static chart. The summary dashboard
+        # has its own reused figure, created by the first summary.
+        self._dpi = dpi
+        self._fig = None
+        self._ax = None
+        self._summary_fig = None
+        self._summary_axes_by_name = None
+        self._summary_overview = None
+
+        # Rendered charts by (data digest, query, options), least recently used first
+        self._chart_cache: "OrderedDict[tuple, str]" = OrderedDict()
 
         # Configure Plotly
         pio.templates.default = "plotly_white"
@@ -36,7 +416,8 @@ class DataVisualizer:
 
         logger.info("Enhanced Data Visualizer initialized with Plotly support")
     
-    def create_visualization(self, data: List[Dict[str, Any]], query: str, use_plotly: bool = True) -> Optional[str]:
+    def create_visualization(self, data: List[Dict[str, Any]], query: str, use_plotly: bool = True,
+                             return_mode: Literal['html', 'datauri'] = 'html') -> Optional[str]:
         """
         Create an enhanced visualization based on the data and query
 
@@ -44,87 +425,83 @@ class DataVisualizer:
             data: List of dictionaries containing the data
             query: Original query that generated the data
             use_plotly: Whether to use Plotly (interactive) or matplotlib (static)
+            return_mode: 'html' returns Plotly charts as a raw HTML page, 'datauri'
+                as a base64 data:text/html URI. Static charts are always PNG data URIs.
 
         Returns:
-            Base64 encoded image string or HTML string for Plotly charts
+            HTML page or data URI for Plotly charts, PNG data URI for matplotlib charts
         """
         if not data:
             logger.warning("No data provided for visualization")
             return None
 
+        # Identical data and query always produce the same chart
+        key = (_data_digest(data), query, use_plotly, return_mode)
+        return self._cached_chart(
+            key, len(data), lambda: self._render_visualization(data, query, use_plotly, return_mode)
+        )
+
+    def _cached_chart(self, key: tuple, n_records: int, render: Callable[[], Optional[str]]) -> Optional[str]:
+        """Return the memoized chart for key, rendering and storing it on a miss"""
+        chart = self._chart_cache.get(key)
+        if chart is not None:
+            self._chart_cache.move_to_end(key)
+            logger.info("Using cached visualization for %s records", n_records)
+            return chart
+
+        chart = render()
+        if chart is not None:
+            self._chart_cache[key] = chart
+            if len(self._chart_cache) > CHART_CACHE_SIZE:
+                self._chart_cache.popitem(last=False)
+        return chart
+
+    def _render_visualization(self, data: List[Dict[str, Any]], query: str, use_plotly: bool,
+                              return_mode: str) -> Optional[str]:
+        """Build the chart for create_visualization (uncached)"""
         try:
             # Convert data to pandas DataFrame
-            df = pd.DataFrame(data)
-            logger.info(f"Creating visualization for {len(df)} records")
+            df = _df_from_records(data)
+            profile = _column_profile(df)
+            logger.info("Creating visualization for %s records", len(df))
 
             # Determine the best visualization type based on data and query
-            viz_type = self._determine_visualization_type(df, query)
-            logger.info(f"Selected visualization type: {viz_type}")
+            viz_type = self._determine_visualization_type(df, query, profile)
+            logger.info("Selected visualization type: %s", viz_type)
 
             if use_plotly:
-                return self._create_plotly_chart(df, query, viz_type)
+                return self._create_plotly_chart(df, query, viz_type, profile, return_mode)
             else:
                 # Fallback to matplotlib
                 if viz_type == "bar_chart":
-                    return self._create_bar_chart(df, query)
+                    return self._create_bar_chart(df, query, profile)
                 elif viz_type == "line_chart":
-                    return self._create_line_chart(df, query)
+                    return self._create_line_chart(df, query, profile)
                 elif viz_type == "pie_chart":
-                    return self._create_pie_chart(df, query)
+                    return self._create_pie_chart(df, query, profile)
                 elif viz_type == "scatter_plot":
-                    return self._create_scatter_plot(df, query)
+                    return self._create_scatter_plot(df, query, profile)
                 elif viz_type == "histogram":
-                    return self._create_histogram(df, query)
+                    return self._create_histogram(df, query, profile)
                 else:
-                    return self._create_default_chart(df, query)
+                    return self._create_default_chart(df, query, profile)
 
         except Exception as e:
-            logger.error(f"Visualization failed: {e}", exc_info=True)
+            logger.error("Visualization failed: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
     
-    def _determine_visualization_type(self, df: pd.DataFrame, query: str) -> str:
+    def _determine_visualization_type(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> str:
         """
         Determine the best visualization type based on data and query
         """
-        query_lower = query.lower()
-        
-        # Check for advanced visualization keywords
-        if any(keyword in query_lower for keyword in ['heatmap', 'heat map', 'correlation matrix']):
-            return "heatmap"
-        elif any(keyword in query_lower for keyword in ['treemap', 'tree map', 'hierarchy']):
-            return "treemap"
-        elif any(keyword in query_lower for keyword in ['funnel', 'conversion']):
-            return "funnel"
-        elif any(keyword in query_lower for keyword in ['gauge', 'meter', 'kpi']):
-            return "gauge"
-        elif any(keyword in query_lower for keyword in ['box plot', 'boxplot', 'quartile']):
-            return "box_plot"
-        elif any(keyword in query_lower for keyword in ['violin plot', 'violinplot', 'density']):
-            return "violin_plot"
-
-        # Check for time-based queries
-        time_keywords = ['trend', 'over time', 'daily', 'monthly', 'yearly', 'date']
-        if any(keyword in query_lower for keyword in time_keywords):
-            return "line_chart"
-
-        # Check for comparison queries
-        comparison_keywords = ['compare', 'vs', 'versus', 'top', 'best', 'worst']
-        if any(keyword in query_lower for keyword in comparison_keywords):
-            return "bar_chart"
-
-        # Check for distribution queries
-        distribution_keywords = ['distribution', 'percentage', 'proportion', 'share']
-        if any(keyword in query_lower for keyword in distribution_keywords):
-            return "pie_chart"
-
-        # Check for correlation queries
-        correlation_keywords = ['correlation', 'relationship', 'scatter']
-        if any(keyword in query_lower for keyword in correlation_keywords):
-            return "scatter_plot"
+        # First keyword group (in priority order) found in the query wins
+        for pattern, viz_type in _VIZ_KEYWORD_PATTERNS:
+            if pattern.search(query):
+                return viz_type
         
         # Default based on data structure
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        categorical_cols = df.select_dtypes(include=['object']).columns
+        numeric_cols = profile.numeric
+        categorical_cols = profile.categorical
         
         if len(numeric_cols) >= 2:
             return "scatter_plot"
@@ -135,7 +512,8 @@ class DataVisualizer:
         else:
             return "bar_chart"
 
-    def _create_plotly_chart(self, df: pd.DataFrame, query: str, viz_type: str) -> str:
+    def _create_plotly_chart(self, df: pd.DataFrame, query: str, viz_type: str, profile: _ColProfile,
+                             return_mode: str = 'html') -> str:
         """
         Create interactive Plotly charts
 
@@ -143,70 +521,72 @@ class DataVisualizer:
             df: DataFrame containing the data
             query: Original query
             viz_type: Type of visualization to create
+            profile: Column roles of df
+            return_mode: 'html' for the raw page, 'datauri' for a base64 data URI
 
         Returns:
-            Base64 encoded HTML string of the Plotly chart
+            HTML page (or data URI) of the Plotly chart
         """
         try:
             if viz_type == "bar_chart":
-                fig = self._create_plotly_bar_chart(df, query)
+                fig = self._create_plotly_bar_chart(df, query, profile)
             elif viz_type == "line_chart":
-                fig = self._create_plotly_line_chart(df, query)
+                fig = self._create_plotly_line_chart(df, query, profile)
             elif viz_type == "pie_chart":
-                fig = self._create_plotly_pie_chart(df, query)
+                fig = self._create_plotly_pie_chart(df, query, profile)
             elif viz_type == "scatter_plot":
-                fig = self._create_plotly_scatter_plot(df, query)
+                fig = self._create_plotly_scatter_plot(df, query, profile)
             elif viz_type == "histogram":
-                fig = self._create_plotly_histogram(df, query)
+                fig = self._create_plotly_histogram(df, query, profile)
             elif viz_type == "heatmap":
-                fig = self._create_plotly_heatmap(df, query)
+                fig = self._create_plotly_heatmap(df, query, profile)
             elif viz_type == "treemap":
-                fig = self._create_plotly_treemap(df, query)
+                fig = self._create_plotly_treemap(df, query, profile)
             elif viz_type == "funnel":
-                fig = self._create_plotly_funnel(df, query)
+                fig = self._create_plotly_funnel(df, query, profile)
             elif viz_type == "gauge":
-                fig = self._create_plotly_gauge(df, query)
+                fig = self._create_plotly_gauge(df, query, profile)
             elif viz_type == "box_plot":
-                fig = self._create_plotly_box_plot(df, query)
+                fig = self._create_plotly_box_plot(df, query, profile)
             elif viz_type == "violin_plot":
-                fig = self._create_plotly_violin_plot(df, query)
+                fig = self._create_plotly_violin_plot(df, query, profile)
             else:
-                fig = self._create_plotly_bar_chart(df, query)  # Default
+                fig = self._create_plotly_bar_chart(df, query, profile)  # Default
 
-            # Convert to HTML and then to base64
-            html_str = pio.to_html(fig, include_plotlyjs='cdn', div_id="plotly-chart")
-            html_bytes = html_str.encode('utf-8')
-            html_b64 = base64.b64encode(html_bytes).decode('utf-8')
+            html_str = _figure_html(fig)
+            if return_mode != 'datauri':
+                return html_str
 
+            # Base64 adds a third to the size, so only encode when asked to
+            html_b64 = base64.b64encode(html_str.encode('utf-8')).decode('utf-8')
             return f"data:text/html;base64,{html_b64}"
 
         except Exception as e:
-            logger.error(f"Plotly chart creation failed: {e}")
+            logger.error("Plotly chart creation failed: %s", e)
             # Fallback to matplotlib
-            return self._create_matplotlib_fallback(df, query, viz_type)
+            return self._create_matplotlib_fallback(df, query, viz_type, profile)
 
-    def _create_plotly_bar_chart(self, df: pd.DataFrame, query: str) -> go.Figure:
+    def _create_plotly_bar_chart(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> go.Figure:
         """Create an interactive bar chart with Plotly"""
-        categorical_cols = df.select_dtypes(include=['object']).columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        categorical_cols = profile.categorical
+        numeric_cols = profile.numeric
 
         if len(categorical_cols) > 0 and len(numeric_cols) > 0:
             x_col = categorical_cols[0]
             y_col = numeric_cols[0]
 
             # Group by categorical column and sum numeric column
-            grouped_data = df.groupby(x_col)[y_col].sum().reset_index()
-
-            fig = px.bar(
-                grouped_data,
-                x=x_col,
-                y=y_col,
-                title=f"Analysis: {query[:50]}...",
-                color=y_col,
-                color_continuous_scale='viridis'
-            )
-
+            grouped_data = _fast_group_sum(df, x_col, y_col)
+
+            values = grouped_data[y_col].to_numpy()
+            fig = go.Figure(go.Bar(
+                x=grouped_data[x_col].to_numpy(),
+                y=values,
+                marker=dict(color=values, colorscale='Viridis', showscale=True,
+                            colorbar=dict(title=y_col))
+            ))
             fig.update_layout(
+                title=f"Analysis: {query[:50]}...",
                 template="plotly_white",
                 font=dict(size=12),
                 title_font_size=16,
@@ -222,44 +602,33 @@ class DataVisualizer:
 
         else:
             # Create a simple bar chart with row indices
-            fig = px.bar(
-                x=list(range(len(df))),
-                y=[1] * len(df),
-                title="Data Overview"
-            )
+            fig = go.Figure(go.Bar(x=np.arange(len(df)), y=np.ones(len(df))))
+            fig.update_layout(title="Data Overview")
 
         return fig
 
-    def _create_plotly_line_chart(self, df: pd.DataFrame, query: str) -> go.Figure:
+    def _create_plotly_line_chart(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> go.Figure:
         """Create an interactive line chart with Plotly"""
         # Find date/time columns
-        date_cols = []
-        for col in df.columns:
-            if any(keyword in col.lower() for keyword in ['date', 'time', 'created', 'updated']):
-                date_cols.append(col)
+        date_cols = profile.date
 
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        numeric_cols = profile.numeric
 
         if date_cols and numeric_cols:
             x_col = date_cols[0]
             y_col = numeric_cols[0]
 
-            # Convert to datetime if possible
-            try:
-                df[x_col] = pd.to_datetime(df[x_col])
-                df = df.sort_values(x_col)
-            except:
-                pass
-
-            fig = px.line(
-                df,
-                x=x_col,
-                y=y_col,
-                title=f"Trend Analysis: {query[:50]}...",
-                markers=True
-            )
+            df = _sorted_by_time(df, x_col)
 
+            df = _downsample_line(df, x_col, y_col)
+
+            fig = go.Figure(go.Scatter(
+                x=df[x_col].to_numpy(),
+                y=df[y_col].to_numpy(),
+                mode='lines+markers'
+            ))
             fig.update_layout(
+                title=f"Trend Analysis: {query[:50]}...",
                 template="plotly_white",
                 font=dict(size=12),
                 title_font_size=16,
@@ -269,34 +638,29 @@ class DataVisualizer:
 
         else:
             # Create a simple line chart
-            fig = px.line(
-                x=list(range(len(df))),
-                y=df.iloc[:, 0] if len(df.columns) > 0 else [1] * len(df),
-                title="Data Trend"
-            )
+            fig = go.Figure(go.Scatter(x=np.arange(len(df)), y=_first_column_values(df), mode='lines'))
+            fig.update_layout(title="Data Trend")
 
         return fig
 
-    def _create_plotly_pie_chart(self, df: pd.DataFrame, query: str) -> go.Figure:
+    def _create_plotly_pie_chart(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> go.Figure:
         """Create an interactive pie chart with Plotly"""
-        categorical_cols = df.select_dtypes(include=['object']).columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        categorical_cols = profile.categorical
+        numeric_cols = profile.numeric
 
         if len(categorical_cols) > 0 and len(numeric_cols) > 0:
             x_col = categorical_cols[0]
             y_col = numeric_cols[0]
 
             # Group by categorical column and sum numeric column
-            grouped_data = df.groupby(x_col)[y_col].sum().reset_index()
-
-            fig = px.pie(
-                grouped_data,
-                values=y_col,
-                names=x_col,
-                title=f"Distribution: {query[:50]}..."
-            )
+            grouped_data = _fast_group_sum(df, x_col, y_col)
 
+            fig = go.Figure(go.Pie(
+                labels=grouped_data[x_col].to_numpy(),
+                values=grouped_data[y_col].to_numpy()
+            ))
             fig.update_layout(
+                title=f"Distribution: {query[:50]}...",
                 template="plotly_white",
                 font=dict(size=12),
                 title_font_size=16
@@ -310,17 +674,17 @@ class DataVisualizer:
 
         else:
             # Create a simple pie chart
-            fig = px.pie(
+            fig = go.Figure(go.Pie(
                 values=[1] * min(len(df), 5),
-                names=[f"Item {i+1}" for i in range(min(len(df), 5))],
-                title="Data Distribution"
-            )
+                labels=[f"Item {i+1}" for i in range(min(len(df), 5))]
+            ))
+            fig.update_layout(title="Data Distribution")
 
         return fig
 
-    def _create_plotly_scatter_plot(self, df: pd.DataFrame, query: str) -> go.Figure:
+    def _create_plotly_scatter_plot(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> go.Figure:
         """Create an interactive scatter plot with Plotly"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        numeric_cols = profile.numeric
 
         if len(numeric_cols) >= 2:
             x_col = numeric_cols[0]
@@ -329,16 +693,25 @@ class DataVisualizer:
             # Add color dimension if there's a third numeric column
             color_col = numeric_cols[2] if len(numeric_cols) > 2 else None
 
-            fig = px.scatter(
-                df,
-                x=x_col,
-                y=y_col,
-                color=color_col,
-                title=f"Correlation Analysis: {query[:50]}...",
-                opacity=0.7
-            )
+            df = _downsample_scatter(df)
 
+            marker = dict(opacity=0.7)
+            if color_col is not None:
+                marker.update(
+                    color=df[color_col].to_numpy(),
+                    colorscale='Plasma',
+                    showscale=True,
+                    colorbar=dict(title=color_col)
+                )
+            trace = go.Scattergl if len(df) > WEBGL_THRESHOLD else go.Scatter
+            fig = go.Figure(trace(
+                x=df[x_col].to_numpy(),
+                y=df[y_col].to_numpy(),
+                mode='markers',
+                marker=marker
+            ))
             fig.update_layout(
+                title=f"Correlation Analysis: {query[:50]}...",
                 template="plotly_white",
                 font=dict(size=12),
                 title_font_size=16,
@@ -348,27 +721,31 @@ class DataVisualizer:
 
         else:
             # Create a simple scatter plot
-            fig = px.scatter(
-                x=list(range(len(df))),
-                y=df.iloc[:, 0] if len(df.columns) > 0 else [1] * len(df),
-                title="Data Scatter Plot"
-            )
+            x = np.arange(len(df))
+            y = _first_column_values(df)
+            trace = go.Scattergl if len(df) > WEBGL_THRESHOLD else go.Scatter
+            fig = go.Figure(trace(x=x, y=y, mode='markers'))
+            fig.update_layout(title="Data Scatter Plot")
 
         return fig
 
-    def _create_plotly_histogram(self, df: pd.DataFrame, query: str) -> go.Figure:
+    def _create_plotly_histogram(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> go.Figure:
         """Create an interactive histogram with Plotly"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        numeric_cols = profile.numeric
 
         if len(numeric_cols) > 0:
             col = numeric_cols[0]
 
-            fig = px.histogram(
-                df,
-                x=col,
-                title=f"Distribution: {query[:50]}...",
-                nbins=20
-            )
+            # Bin on the server so only the bar heights are sent to the browser
+            counts, edges = _histogram(df[col])
+            fig = go.Figure(go.Bar(
+                x=(edges[:-1] + edges[1:]) / 2,
+                y=counts,
+                width=np.diff(edges),
+                customdata=np.column_stack([edges[:-1], edges[1:]]),
+                hovertemplate="%{customdata[0]:,.2f} - %{customdata[1]:,.2f}<br>Count: %{y}<extra></extra>"
+            ))
+            fig.update_layout(title=f"Distribution: {query[:50]}...", bargap=0)
 
             fig.update_layout(
                 template="plotly_white",
@@ -380,27 +757,27 @@ class DataVisualizer:
 
         else:
             # Create a simple histogram
-            fig = px.histogram(
-                x=[1] * len(df),
-                title="Data Distribution"
-            )
+            fig = go.Figure(go.Histogram(x=np.ones(len(df))))
+            fig.update_layout(title="Data Distribution")
 
         return fig
 
-    def _create_plotly_heatmap(self, df: pd.DataFrame, query: str) -> go.Figure:
+    def _create_plotly_heatmap(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> go.Figure:
         """Create an interactive heatmap with Plotly"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        numeric_cols = profile.numeric
 
         if len(numeric_cols) >= 2:
             # Create correlation heatmap
-            corr_matrix = df[numeric_cols].corr()
+            corr_matrix = _fast_corr(df, numeric_cols)
 
-            fig = px.imshow(
-                corr_matrix,
-                title=f"Correlation Heatmap: {query[:50]}...",
-                color_continuous_scale='RdBu',
-                aspect='auto'
-            )
+            fig = go.Figure(go.Heatmap(
+                z=corr_matrix.to_numpy(),
+                x=list(corr_matrix.columns),
+                y=list(corr_matrix.index),
+                colorscale='RdBu'
+            ))
+            fig.update_layout(title=f"Correlation Heatmap: {query[:50]}...")
+            fig.update_yaxes(autorange='reversed')
 
             fig.update_layout(
                 template="plotly_white",
@@ -410,17 +787,16 @@ class DataVisualizer:
 
         else:
             # Create a simple heatmap from the data
-            fig = px.imshow(
-                df.select_dtypes(include=[np.number]).values,
-                title="Data Heatmap"
-            )
+            fig = go.Figure(go.Heatmap(z=df[profile.numeric].to_numpy()))
+            fig.update_layout(title="Data Heatmap")
+            fig.update_yaxes(autorange='reversed')
 
         return fig
 
-    def _create_plotly_treemap(self, df: pd.DataFrame, query: str) -> go.Figure:
+    def _create_plotly_treemap(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> go.Figure:
         """Create an interactive treemap with Plotly"""
-        categorical_cols = df.select_dtypes(include=['object']).columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        categorical_cols = profile.categorical
+        numeric_cols = profile.numeric
 
         if len(categorical_cols) >= 1 and len(numeric_cols) >= 1:
             # Use first categorical column as labels and first numeric as values
@@ -428,9 +804,9 @@ class DataVisualizer:
             values_col = numeric_cols[0]
 
             # Group data if needed
-            grouped_data = df.groupby(labels_col)[values_col].sum().reset_index()
+            grouped_data = _fast_group_sum(df, labels_col, values_col)
 
-            fig = px.treemap(
+            fig = _px().treemap(
                 grouped_data,
                 path=[labels_col],
                 values=values_col,
@@ -445,7 +821,7 @@ class DataVisualizer:
 
         else:
             # Create a simple treemap
-            fig = px.treemap(
+            fig = _px().treemap(
                 names=[f"Item {i+1}" for i in range(min(len(df), 10))],
                 values=[1] * min(len(df), 10),
                 title="Data Treemap"
@@ -453,10 +829,10 @@ class DataVisualizer:
 
         return fig
 
-    def _create_plotly_funnel(self, df: pd.DataFrame, query: str) -> go.Figure:
+    def _create_plotly_funnel(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> go.Figure:
         """Create an interactive funnel chart with Plotly"""
-        categorical_cols = df.select_dtypes(include=['object']).columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        categorical_cols = profile.categorical
+        numeric_cols = profile.numeric
 
         if len(categorical_cols) >= 1 and len(numeric_cols) >= 1:
             labels_col = categorical_cols[0]
@@ -489,9 +865,9 @@ class DataVisualizer:
 
         return fig
 
-    def _create_plotly_gauge(self, df: pd.DataFrame, query: str) -> go.Figure:
+    def _create_plotly_gauge(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> go.Figure:
         """Create an interactive gauge chart with Plotly"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        numeric_cols = profile.numeric
 
         if len(numeric_cols) >= 1:
             # Use first numeric column for gauge value
@@ -537,10 +913,10 @@ class DataVisualizer:
 
         return fig
 
-    def _create_plotly_box_plot(self, df: pd.DataFrame, query: str) -> go.Figure:
+    def _create_plotly_box_plot(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> go.Figure:
         """Create an interactive box plot with Plotly"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        categorical_cols = df.select_dtypes(include=['object']).columns
+        numeric_cols = profile.numeric
+        categorical_cols = profile.categorical
 
         if len(numeric_cols) >= 1:
             y_col = numeric_cols[0]
@@ -548,21 +924,12 @@ class DataVisualizer:
             if len(categorical_cols) >= 1:
                 # Box plot by category
                 x_col = categorical_cols[0]
-                fig = px.box(
-                    df,
-                    x=x_col,
-                    y=y_col,
-                    title=f"Box Plot: {query[:50]}..."
-                )
+                fig = go.Figure(go.Box(x=df[x_col].to_numpy(), y=df[y_col].to_numpy()))
             else:
                 # Single box plot
-                fig = px.box(
-                    df,
-                    y=y_col,
-                    title=f"Box Plot: {query[:50]}..."
-                )
-
+                fig = go.Figure(go.Box(y=df[y_col].to_numpy(), name=y_col))
             fig.update_layout(
+                title=f"Box Plot: {query[:50]}...",
                 template="plotly_white",
                 font=dict(size=12),
                 title_font_size=16
@@ -570,17 +937,15 @@ class DataVisualizer:
 
         else:
             # Create a sample box plot
-            fig = px.box(
-                y=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
-                title="Sample Box Plot"
-            )
+            fig = go.Figure(go.Box(y=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10]))
+            fig.update_layout(title="Sample Box Plot")
 
         return fig
 
-    def _create_plotly_violin_plot(self, df: pd.DataFrame, query: str) -> go.Figure:
+    def _create_plotly_violin_plot(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> go.Figure:
         """Create an interactive violin plot with Plotly"""
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        categorical_cols = df.select_dtypes(include=['object']).columns
+        numeric_cols = profile.numeric
+        categorical_cols = profile.categorical
 
         if len(numeric_cols) >= 1:
             y_col = numeric_cols[0]
@@ -588,23 +953,14 @@ class DataVisualizer:
             if len(categorical_cols) >= 1:
                 # Violin plot by category
                 x_col = categorical_cols[0]
-                fig = px.violin(
-                    df,
-                    x=x_col,
-                    y=y_col,
-                    title=f"Violin Plot: {query[:50]}...",
-                    box=True
-                )
+                fig = go.Figure(go.Violin(
+                    x=df[x_col].to_numpy(), y=df[y_col].to_numpy(), box_visible=True
+                ))
             else:
                 # Single violin plot
-                fig = px.violin(
-                    df,
-                    y=y_col,
-                    title=f"Violin Plot: {query[:50]}...",
-                    box=True
-                )
-
+                fig = go.Figure(go.Violin(y=df[y_col].to_numpy(), name=y_col, box_visible=True))
             fig.update_layout(
+                title=f"Violin Plot: {query[:50]}...",
                 template="plotly_white",
                 font=dict(size=12),
                 title_font_size=16
@@ -612,38 +968,69 @@ class DataVisualizer:
 
         else:
             # Create a sample violin plot
-            fig = px.violin(
-                y=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
-                title="Sample Violin Plot",
-                box=True
-            )
+            fig = go.Figure(go.Violin(y=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10], box_visible=True))
+            fig.update_layout(title="Sample Violin Plot")
 
         return fig
 
-    def _create_matplotlib_fallback(self, df: pd.DataFrame, query: str, viz_type: str) -> str:
+    def _create_matplotlib_fallback(self, df: pd.DataFrame, query: str, viz_type: str, profile: _ColProfile) -> str:
         """Fallback to matplotlib if Plotly fails"""
         logger.warning("Falling back to matplotlib for visualization")
 
         if viz_type == "bar_chart":
-            return self._create_bar_chart(df, query)
+            return self._create_bar_chart(df, query, profile)
         elif viz_type == "line_chart":
-            return self._create_line_chart(df, query)
+            return self._create_line_chart(df, query, profile)
         elif viz_type == "pie_chart":
-            return self._create_pie_chart(df, query)
+            return self._create_pie_chart(df, query, profile)
         elif viz_type == "scatter_plot":
-            return self._create_scatter_plot(df, query)
+            return self._create_scatter_plot(df, query, profile)
         elif viz_type == "histogram":
-            return self._create_histogram(df, query)
+            return self._create_histogram(df, query, profile)
         else:
-            return self._create_default_chart(df, query)
+            return self._create_default_chart(df, query, profile)
 
-    def _create_bar_chart(self, df: pd.DataFrame, query: str) -> str:
+    def _new_axes(self, figsize=(10, 6)):
+        """
+        Clear the reused figure for a new chart and return a fresh Axes on it
+
+        The Axes is rebuilt rather than cleared, since Axes.clear() keeps
+        state such as the equal aspect and hidden frame a pie chart leaves.
+        """
+        if self._fig is None:
+            _plt()
+            from matplotlib.figure import Figure
+            self._fig = Figure(figsize=figsize)
+        self._fig.clear()
+        self._fig.set_size_inches(*figsize)
+        self._ax = self._fig.add_subplot()
+        return self._ax
+
+    def _summary_axes(self) -> Dict[str, Any]:
+        """Clear the reused summary dashboard figure and return its panel axes by name"""
+        if self._summary_fig is None:
+            _plt()
+            from matplotlib.figure import Figure
+            fig = Figure(figsize=(12, 8), layout='constrained')
+            # The text-only overview cell is left empty ('.') so it gets no
+            # Axes, ticks or spines; its text is drawn on the figure instead
+            self._summary_axes_by_name = fig.subplot_mosaic([['top', 'dist'], ['.', 'missing']])
+            fig.suptitle('Data Summary Dashboard', fontsize=16)
+            fig.text(0.25, 0.44, 'Data Overview', ha='center', fontsize='large')
+            self._summary_overview = fig.text(0.07, 0.22, '', va='center', fontsize=12)
+            self._summary_fig = fig
+        for ax in self._summary_axes_by_name.values():
+            ax.clear()
+            ax.set_axis_on()
+        return self._summary_axes_by_name
+
+    def _create_bar_chart(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> str:
         """Create a bar chart"""
-        plt.figure(figsize=(10, 6))
+        ax = self._new_axes()
         
         # Find categorical and numeric columns
-        categorical_cols = df.select_dtypes(include=['object']).columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        categorical_cols = profile.categorical
+        numeric_cols = profile.numeric
         
         if len(categorical_cols) > 0 and len(numeric_cols) > 0:
             # Use first categorical column as x-axis and first numeric as y-axis
@@ -651,148 +1038,151 @@ class DataVisualizer:
             y_col = numeric_cols[0]
             
             # Group by categorical column and sum numeric column
-            grouped_data = df.groupby(x_col)[y_col].sum().reset_index()
+            grouped_data = _fast_group_sum(df, x_col, y_col)
             
-            plt.bar(grouped_data[x_col], grouped_data[y_col])
-            plt.xlabel(x_col.replace('_', ' ').title())
-            plt.ylabel(y_col.replace('_', ' ').title())
-            plt.title(f"Analysis: {query[:50]}...")
-            plt.xticks(rotation=45, ha='right')
-            plt.tight_layout()
+            ax.bar(grouped_data[x_col], grouped_data[y_col])
+            ax.set_xlabel(x_col.replace('_', ' ').title())
+            ax.set_ylabel(y_col.replace('_', ' ').title())
+            ax.set_title(f"Analysis: {query[:50]}...")
+            ax.tick_params(axis='x', labelrotation=45)
+            _plt().setp(ax.get_xticklabels(), ha='right')
         
+        self._fig.tight_layout()
         return self._save_plot_to_base64()
     
-    def _create_line_chart(self, df: pd.DataFrame, query: str) -> str:
+    def _create_line_chart(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> str:
         """Create a line chart"""
-        plt.figure(figsize=(10, 6))
+        ax = self._new_axes()
         
         # Find date/time columns
-        date_cols = []
-        for col in df.columns:
-            if any(keyword in col.lower() for keyword in ['date', 'time', 'created', 'updated']):
-                date_cols.append(col)
+        date_cols = profile.date
         
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        numeric_cols = profile.numeric
         
         if date_cols and numeric_cols:
             x_col = date_cols[0]
             y_col = numeric_cols[0]
             
-            # Convert to datetime if possible
-            try:
-                df[x_col] = pd.to_datetime(df[x_col])
-                df = df.sort_values(x_col)
-            except:
-                pass
+            df = _sorted_by_time(df, x_col)
             
-            plt.plot(df[x_col], df[y_col], marker='o')
-            plt.xlabel(x_col.replace('_', ' ').title())
-            plt.ylabel(y_col.replace('_', ' ').title())
-            plt.title(f"Trend Analysis: {query[:50]}...")
-            plt.xticks(rotation=45, ha='right')
-            plt.tight_layout()
+            ax.plot(df[x_col], df[y_col], marker='o')
+            ax.set_xlabel(x_col.replace('_', ' ').title())
+            ax.set_ylabel(y_col.replace('_', ' ').title())
+            ax.set_title(f"Trend Analysis: {query[:50]}...")
+            ax.tick_params(axis='x', labelrotation=45)
+            _plt().setp(ax.get_xticklabels(), ha='right')
         
+        self._fig.tight_layout()
         return self._save_plot_to_base64()
     
-    def _create_pie_chart(self, df: pd.DataFrame, query: str) -> str:
+    def _create_pie_chart(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> str:
         """Create a pie chart"""
-        plt.figure(figsize=(10, 8))
+        ax = self._new_axes(figsize=(10, 8))
         
-        categorical_cols = df.select_dtypes(include=['object']).columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        categorical_cols = profile.categorical
+        numeric_cols = profile.numeric
         
         if len(categorical_cols) > 0 and len(numeric_cols) > 0:
             x_col = categorical_cols[0]
             y_col = numeric_cols[0]
             
             # Group by categorical column and sum numeric column
-            grouped_data = df.groupby(x_col)[y_col].sum()
+            grouped_data = _fast_group_sum(df, x_col, y_col, as_index=True)
             
-            plt.pie(grouped_data.values, labels=grouped_data.index, autopct='%1.1f%%')
-            plt.title(f"Distribution: {query[:50]}...")
-            plt.axis('equal')
+            ax.pie(grouped_data.values, labels=grouped_data.index, autopct='%1.1f%%')
+            ax.set_title(f"Distribution: {query[:50]}...")
+            ax.axis('equal')
         
+        self._fig.tight_layout()
         return self._save_plot_to_base64()
     
-    def _create_scatter_plot(self, df: pd.DataFrame, query: str) -> str:
+    def _create_scatter_plot(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> str:
         """Create a scatter plot"""
-        plt.figure(figsize=(10, 6))
+        ax = self._new_axes()
         
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        numeric_cols = profile.numeric
         
         if len(numeric_cols) >= 2:
             x_col = numeric_cols[0]
             y_col = numeric_cols[1]
             
-            plt.scatter(df[x_col], df[y_col], alpha=0.6)
-            plt.xlabel(x_col.replace('_', ' ').title())
-            plt.ylabel(y_col.replace('_', ' ').title())
-            plt.title(f"Correlation Analysis: {query[:50]}...")
-            plt.grid(True, alpha=0.3)
-            plt.tight_layout()
+            ax.scatter(df[x_col], df[y_col], alpha=0.6)
+            ax.set_xlabel(x_col.replace('_', ' ').title())
+            ax.set_ylabel(y_col.replace('_', ' ').title())
+            ax.set_title(f"Correlation Analysis: {query[:50]}...")
+            ax.grid(True, alpha=0.3)
         
+        self._fig.tight_layout()
         return self._save_plot_to_base64()
     
-    def _create_histogram(self, df: pd.DataFrame, query: str) -> str:
+    def _create_histogram(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> str:
         """Create a histogram"""
-        plt.figure(figsize=(10, 6))
+        ax = self._new_axes()
         
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        numeric_cols = profile.numeric
         
         if len(numeric_cols) > 0:
             col = numeric_cols[0]
             
-            plt.hist(df[col], bins=20, alpha=0.7, edgecolor='black')
-            plt.xlabel(col.replace('_', ' ').title())
-            plt.ylabel('Frequency')
-            plt.title(f"Distribution: {query[:50]}...")
-            plt.grid(True, alpha=0.3)
-            plt.tight_layout()
+            counts, edges = _histogram(df[col])
+            ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.7, edgecolor='black')
+            ax.set_xlabel(col.replace('_', ' ').title())
+            ax.set_ylabel('Frequency')
+            ax.set_title(f"Distribution: {query[:50]}...")
+            ax.grid(True, alpha=0.3)
         
+        self._fig.tight_layout()
         return self._save_plot_to_base64()
     
-    def _create_default_chart(self, df: pd.DataFrame, query: str) -> str:
+    def _create_default_chart(self, df: pd.DataFrame, query: str, profile: _ColProfile) -> str:
         """Create a default chart when other types don't fit"""
-        plt.figure(figsize=(10, 6))
+        ax = self._new_axes()
         
         # Simple bar chart of first few rows
         if len(df) > 0:
             # Use first column as labels, second as values if available
             if len(df.columns) >= 2:
-                x_data = df.iloc[:10, 0].astype(str)
-                y_data = df.iloc[:10, 1] if df.iloc[:10, 1].dtype in ['int64', 'float64'] else range(len(x_data))
+                x_data = df[df.columns[0]].to_numpy()[:10].astype(str)
+                y_col = df.columns[1]
+                y_data = df[y_col].to_numpy()[:10] if y_col in profile.numeric else np.arange(len(x_data))
             else:
-                x_data = range(len(df))
-                y_data = range(len(df))
+                x_data = np.arange(len(df))
+                y_data = x_data
             
-            plt.bar(x_data, y_data)
-            plt.xlabel('Index')
-            plt.ylabel('Value')
-            plt.title(f"Data Overview: {query[:50]}...")
-            plt.xticks(rotation=45, ha='right')
-            plt.tight_layout()
+            ax.bar(x_data, y_data)
+            ax.set_xlabel('Index')
+            ax.set_ylabel('Value')
+            ax.set_title(f"Data Overview: {query[:50]}...")
+            ax.tick_params(axis='x', labelrotation=45)
+            _plt().setp(ax.get_xticklabels(), ha='right')
         
+        self._fig.tight_layout()
         return self._save_plot_to_base64()
     
-    def _save_plot_to_base64(self) -> str:
-        """Save the current plot to a base64 encoded string"""
+    def _save_plot_to_base64(self, fig: Optional["Figure"] = None) -> str:
+        """
+        Save a figure to a base64 encoded PNG data URI
+
+        Args:
+            fig: The figure to save; defaults to the reused chart figure.
+                Figures are kept open for the next chart.
+        """
+        target = self._fig if fig is None else fig
         try:
-            # Save plot to bytes buffer
+            # Save plot to bytes buffer; every chart builder lays out its figure
+            # (tight_layout, or the constrained engine for the summary) on all
+            # paths, so skip bbox_inches='tight', which renders an extra time
             buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-            buffer.seek(0)
+            target.savefig(buffer, format='png', dpi=self._dpi,
+                           pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL})
             
-            # Convert to base64
-            image_base64 = base64.b64encode(buffer.getvalue()).decode()
-            
-            # Close the plot to free memory
-            plt.close()
+            # Convert to base64 straight from the buffer, without copying it out
+            image_base64 = base64.b64encode(buffer.getbuffer()).decode('ascii')
             
             return f"data:image/png;base64,{image_base64}"
             
         except Exception as e:
             print(f"Failed to save plot: {e}")
-            plt.close()
             return None
     
     def create_summary_chart(self, data: List[Dict[str, Any]]) -> Optional[str]:
@@ -802,50 +1192,66 @@ class DataVisualizer:
         if not data:
             return None
         
+        # The dashboard depends only on the rows, so it shares the chart cache
+        return self._cached_chart(
+            (_data_digest(data), 'summary'), len(data), lambda: self._render_summary_chart(data)
+        )
+    
+    def _render_summary_chart(self, data: List[Dict[str, Any]]) -> Optional[str]:
+        """Build the dashboard for create_summary_chart (uncached)"""
         try:
-            df = pd.DataFrame(data)
+            df = _df_from_records(data)
+            profile = _column_profile(df)
             
-            plt.figure(figsize=(12, 8))
+            categorical_cols = profile.categorical
+            numeric_cols = profile.numeric
             
-            # Create subplots for different metrics
-            fig, axes = plt.subplots(2, 2, figsize=(12, 8))
-            fig.suptitle('Data Summary Dashboard', fontsize=16)
+            # Extract the numeric columns once for both the histogram and the missing counts
+            numeric_arr = _numeric_array(df, numeric_cols) if numeric_cols else None
             
-            # Plot 1: Record count by category (if categorical data exists)
-            categorical_cols = df.select_dtypes(include=['object']).columns
+            # Run the per-panel aggregations (in parallel for large frames), then draw serially
+            tasks = {'missing': (_missing_counts, df, numeric_cols, numeric_arr)}
             if len(categorical_cols) > 0:
+                tasks['top'] = (_top_values, df[categorical_cols[0]], 5)
+            if len(numeric_cols) > 0:
+                tasks['dist'] = (_histogram, numeric_arr[:, 0])
+            results = _run_aggregations(tasks, parallel=len(df) >= SUMMARY_PARALLEL_MIN_ROWS)
+            
+            # Reuse the dashboard figure and its subplots for different metrics
+            axes = self._summary_axes()
+            
+            # Plot 1: Record count by category (if categorical data exists)
+            if 'top' in results:
                 col = categorical_cols[0]
-                value_counts = df[col].value_counts().head(5)
-                axes[0, 0].bar(value_counts.index, value_counts.values)
-                axes[0, 0].set_title(f'Top 5 {col.title()}')
-                axes[0, 0].tick_params(axis='x', rotation=45)
+                value_counts = results['top']
+                x = np.arange(len(value_counts))
+                axes['top'].bar(x, value_counts.to_numpy())
+                axes['top'].set_xticks(x, value_counts.index.astype(str), rotation=45, ha='right')
+                axes['top'].set_title(f'Top 5 {col.title()}')
             
             # Plot 2: Numeric data distribution
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            if len(numeric_cols) > 0:
+            if 'dist' in results:
                 col = numeric_cols[0]
-                axes[0, 1].hist(df[col], bins=20, alpha=0.7)
-                axes[0, 1].set_title(f'{col.title()} Distribution')
+                counts, edges = results['dist']
+                axes['dist'].bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.7)
+                axes['dist'].set_title(f'{col.title()} Distribution')
             
-            # Plot 3: Data overview
-            axes[1, 0].text(0.1, 0.5, f'Total Records: {len(df)}\nColumns: {len(df.columns)}', 
-                           transform=axes[1, 0].transAxes, fontsize=12)
-            axes[1, 0].set_title('Data Overview')
-            axes[1, 0].axis('off')
+            # Plot 3: Data overview, as figure text in the empty lower-left cell
+            self._summary_overview.set_text(f'Total Records: {len(df)}\nColumns: {len(df.columns)}')
             
             # Plot 4: Missing data
-            missing_data = df.isnull().sum()
-            if missing_data.sum() > 0:
-                axes[1, 1].bar(missing_data.index, missing_data.values)
-                axes[1, 1].set_title('Missing Data')
-                axes[1, 1].tick_params(axis='x', rotation=45)
+            missing_data = results['missing']
+            axes['missing'].set_title('Missing Data')
+            if missing_data.to_numpy().any():
+                x = np.arange(len(missing_data))
+                axes['missing'].bar(x, missing_data.to_numpy())
+                axes['missing'].set_xticks(x, missing_data.index.astype(str), rotation=45, ha='right')
             else:
-                axes[1, 1].text(0.5, 0.5, 'No Missing Data', 
-                               transform=axes[1, 1].transAxes, ha='center', va='center')
-                axes[1, 1].set_title('Missing Data')
+                axes['missing'].text(0.5, 0.5, 'No Missing Data',
+                                     transform=axes['missing'].transAxes, ha='center', va='center')
+                axes['missing'].set_axis_off()
             
-            plt.tight_layout()
-            return self._save_plot_to_base64()
+            return self._save_plot_to_base64(self._summary_fig)
             
         except Exception as e:
             print(f"Summary chart creation failed: {e}")
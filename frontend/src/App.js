@@ -354,7 +354,13 @@ function App() {
               <div className="section">
                 <div className="section-header">📊 Visualization</div>
                 <div className="visualization-container">
-                  {response.visualization.startsWith('data:text/html') ? (
+                  {response.visualization.startsWith('data:image') ? (
+                    <img
+                      src={response.visualization}
+                      alt="Visualization"
+                      className="visualization-img"
+                    />
+                  ) : response.visualization.startsWith('data:') ? (
                     <iframe
                       src={response.visualization}
                       className="visualization-iframe"
@@ -362,10 +368,11 @@ function App() {
                       frameBorder="0"
                     />
                   ) : (
-                    <img
-                      src={response.visualization}
-                      alt="Visualization"
-                      className="visualization-img"
+                    <iframe
+                      srcDoc={response.visualization}
+                      className="visualization-iframe"
+                      title="Interactive Chart"
+                      frameBorder="0"
                     />
                   )}
                 </div>
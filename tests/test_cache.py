@@ -0,0 +1,96 @@
+"""
+Tests for the sharded SimpleCache: expiry heap, entry freelist and LRU eviction
+"""
+import types
+
+import pytest
+
+import app.cache as cache_module
+from app.cache import NUM_SHARDS, SimpleCache
+
+
+class FakeClock:
+    """Stand-in for the time module with a manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module, "time", types.SimpleNamespace(monotonic=fake.monotonic, time=fake.time))
+    return fake
+
+
+def _same_shard_queries(cache, count):
+    """Find queries whose keys all land in the same shard"""
+    by_shard = {}
+    i = 0
+    while True:
+        query = f"query {i}"
+        shard = cache._get_shard(cache.key_for(query, None))
+        queries = by_shard.setdefault(id(shard), [])
+        queries.append(query)
+        if len(queries) == count:
+            return shard, queries
+        i += 1
+
+
+def test_overwrite_survives_cleanup_of_stale_deadline(clock):
+    cache = SimpleCache(max_size=100, default_ttl=10)
+    cache.set("total sales", "old")
+    cache.set("total sales", "new", ttl=100)
+
+    # The first deadline has passed, but it belongs to the overwritten value
+    clock.now += 50
+    assert cache.cleanup_expired() == 0
+    assert cache.get("total sales") == "new"
+
+    clock.now += 60
+    assert cache.cleanup_expired() == 1
+    assert cache.get("total sales") is None
+
+
+def test_evicted_entry_is_recycled_without_its_old_value(clock):
+    # One entry per shard, so a second key in a shard evicts the first
+    cache = SimpleCache(max_size=NUM_SHARDS, default_ttl=60)
+    shard, (first, second, third) = _same_shard_queries(cache, 3)
+
+    cache.set(first, "first value")
+    first_entry = shard.entries[cache.key_for(first, None)]
+    cache.set(second, "second value")
+
+    assert cache.get(first) is None
+    assert shard.free == [first_entry]
+    assert first_entry.data is None
+
+    cache.set(third, "third value")
+    third_entry = shard.entries[cache.key_for(third, None)]
+    assert third_entry is first_entry
+    assert third_entry.data == "third value"
+    assert third_entry.access_count == 0
+    assert cache.get(second) is None
+    assert cache.get(third) == "third value"
+
+
+def test_stats_after_expiry(clock):
+    cache = SimpleCache(max_size=100, default_ttl=10)
+    cache.set("short one", 1)
+    cache.set("short two", 2)
+    cache.set("long lived", 3, ttl=100)
+    assert cache.get("long lived") == 3
+
+    clock.now += 50
+    assert cache.cleanup_expired() == 2
+
+    stats = cache.stats()
+    assert stats["size"] == 1
+    assert stats["total_accesses"] == 1
+    assert stats["oldest_entry"] == stats["newest_entry"] == 1000.0
@@ -0,0 +1,114 @@
+"""
+Tests for DataVisualizer's static (matplotlib) charts and its data helpers
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import app.visualizer as visualizer
+from app.visualizer import (
+    DataVisualizer, _column_profile, _df_from_records, _downsample_line, _histogram, _lttb_indices
+)
+
+
+def _frame(data):
+    df = _df_from_records(data)
+    return df, _column_profile(df)
+
+
+def test_bar_chart_after_pie_chart_resets_axes_state():
+    """A pie chart's equal aspect and hidden frame must not leak into the next chart"""
+    viz = DataVisualizer()
+    df, profile = _frame([
+        {"category": "Books", "sales": 120.0},
+        {"category": "Toys", "sales": 80.0},
+        {"category": "Games", "sales": 45.5},
+    ])
+
+    assert viz._create_pie_chart(df, "sales by category", profile).startswith("data:image/png;base64,")
+    assert viz._create_bar_chart(df, "sales by category", profile).startswith("data:image/png;base64,")
+
+    assert viz._ax.get_aspect() == "auto"
+    assert viz._ax.get_frame_on()
+    assert viz._ax.axison
+
+
+@pytest.fixture(params=["fast_histogram", "numba", "numpy"])
+def histogram_backend(request, monkeypatch):
+    """Force _histogram onto one binning backend, skipping it if not installed"""
+    if request.param == "fast_histogram":
+        monkeypatch.setattr(visualizer, "fast_histogram", pytest.importorskip("fast_histogram"))
+    else:
+        monkeypatch.setattr(visualizer, "fast_histogram", None)
+    if request.param == "numba":
+        pytest.importorskip("numba")
+        monkeypatch.setattr(visualizer, "_HAS_NUMBA", True)
+    else:
+        monkeypatch.setattr(visualizer, "_HAS_NUMBA", False)
+    return request.param
+
+
+@pytest.mark.parametrize("values", [
+    # The maximum sits exactly on the right edge and must land in the last bin
+    np.array([0.0, 1.5, 2.5, 7.25, 10.0, 10.0]),
+    # A constant column, where lo == hi
+    np.full(7, 3.0),
+    # float32 with missing values, which must be ignored
+    np.array([np.nan, 0.0, 4.0, np.nan, 19.0, 20.0, 5.5], dtype=np.float32),
+    # Seeded random data, where no value is expected to sit exactly on an edge
+    np.random.default_rng(0).normal(size=1000),
+], ids=["right-edge", "constant", "float32-nan", "random"])
+def test_histogram_matches_numpy(histogram_backend, values):
+    finite = values[~np.isnan(values)]
+    expected_counts, expected_edges = np.histogram(finite, bins=visualizer.HISTOGRAM_BINS)
+
+    counts, edges = _histogram(values)
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_allclose(edges, expected_edges, rtol=1e-6)
+
+    # A pandas column with missing values takes the same path
+    counts, _ = _histogram(pd.Series(values, dtype="float64"))
+    np.testing.assert_array_equal(counts, expected_counts)
+
+
+def _sine_series(n):
+    x = np.arange(n, dtype=np.float64)
+    return x, np.sin(x / 7.0) * 100 + (x % 13)
+
+
+def test_lttb_is_identity_when_series_fits():
+    x, y = _sine_series(50)
+    np.testing.assert_array_equal(_lttb_indices(x, y, 50), np.arange(50))
+    np.testing.assert_array_equal(_lttb_indices(x, y, 80), np.arange(50))
+
+
+def test_lttb_keeps_endpoints_and_increasing_indices():
+    x, y = _sine_series(1000)
+    keep = _lttb_indices(x, y, 100)
+
+    assert len(keep) == 100
+    assert keep[0] == 0
+    assert keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_lttb_keeps_a_lone_spike():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[537] = 1000.0
+    assert 537 in _lttb_indices(x, y, 50)
+
+
+def test_downsample_line():
+    x, y = _sine_series(300)
+    df = pd.DataFrame({"day": x, "sales": y})
+
+    # Frames within the target are returned untouched
+    assert _downsample_line(df, "day", "sales", n_target=300) is df
+
+    reduced = _downsample_line(df, "day", "sales", n_target=40)
+    assert len(reduced) == 40
+    assert reduced.index[0] == 0
+    assert reduced.index[-1] == 299
+    assert reduced.index.is_monotonic_increasing
+    assert reduced.index.is_unique